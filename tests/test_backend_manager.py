@@ -0,0 +1,328 @@
+import importlib.util
+import os
+import subprocess
+from pathlib import Path
+
+
+def load_backend_manager(tmp_path, monkeypatch):
+    """Load wall-it-backend-manager.py with an isolated cache dir and a Niri session."""
+    monkeypatch.setenv("WALLIT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("WALLIT_WALLPAPER_DIR", str(tmp_path / "wallpapers"))
+    monkeypatch.setenv("XDG_CURRENT_DESKTOP", "niri")
+    monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-1")
+    monkeypatch.delenv("DISPLAY", raising=False)
+
+    module_path = Path(__file__).resolve().parents[1] / "wall-it-backend-manager.py"
+    spec = importlib.util.spec_from_file_location("wall_it_backend_manager_test", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_fake_backend(calls):
+    class FakeNiri:
+        name = "Niri"
+
+        def __init__(self):
+            calls["init"] += 1
+
+        def is_available(self):
+            calls["probe"] += 1
+            return True
+
+    return FakeNiri
+
+
+def test_detection_is_cached_across_instances(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    calls = {"init": 0, "probe": 0}
+    monkeypatch.setattr(bm, "_BACKEND_CLASSES", {"niri": make_fake_backend(calls)})
+
+    first = bm.BackendManager()
+    second = bm.BackendManager()
+
+    assert first.get_backend() is second.get_backend()
+    assert calls == {"init": 1, "probe": 1}
+    assert bm.config.BACKEND_CACHE_FILE.read_text().startswith("niri\n")
+
+
+def test_persisted_backend_skips_probe(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    calls = {"init": 0, "probe": 0}
+    monkeypatch.setattr(bm, "_BACKEND_CLASSES", {"niri": make_fake_backend(calls)})
+
+    bm.BackendManager()
+    monkeypatch.setattr(bm, "_DETECTED_BACKEND", None)
+    manager = bm.BackendManager()
+
+    assert manager.get_backend_name() == "Niri"
+    assert calls == {"init": 2, "probe": 1}
+
+
+def test_persisted_backend_ignored_in_other_session(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    calls = {"init": 0, "probe": 0}
+    monkeypatch.setattr(bm, "_BACKEND_CLASSES", {"niri": make_fake_backend(calls)})
+
+    bm.BackendManager()
+    monkeypatch.setattr(bm, "_DETECTED_BACKEND", None)
+    monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-2")
+    bm.BackendManager()
+
+    assert calls["probe"] == 2
+
+
+def test_detection_prefers_first_available_in_order(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+
+    class Unavailable:
+        name = "Niri"
+
+        def is_available(self):
+            return False
+
+    class Hyprland:
+        name = "Hyprland"
+
+        def is_available(self):
+            return True
+
+    class Kde:
+        name = "KDE"
+
+        def is_available(self):
+            return True
+
+    monkeypatch.setattr(
+        bm, "_BACKEND_CLASSES", {"niri": Unavailable, "hyprland": Hyprland, "kde": Kde}
+    )
+
+    assert bm.BackendManager().get_backend_name() == "Hyprland"
+
+
+def test_run_probe_reports_exit_status_and_timeout(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+
+    assert bm._run_probe(["true"]) is True
+    assert bm._run_probe(["false"]) is False
+    assert bm._run_probe(["sleep", "5"], timeout=0.1) is False
+    assert bm._run_probe(["wall-it-no-such-command"]) is False
+
+
+def test_niri_monitor_from_json(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    outputs = {
+        "DP-1": {
+            "name": "DP-1", "make": "Dell Inc.", "model": "U3421WE", "serial": None,
+            "modes": [{"width": 3440, "height": 1440, "refresh_rate": 155000, "is_preferred": True}],
+            "current_mode": 0,
+            "logical": {"x": 0, "y": 0, "width": 2457, "height": 1028, "scale": 1.4, "transform": "Normal"},
+        },
+        "eDP-1": {
+            "name": "eDP-1", "make": None, "model": None, "serial": None,
+            "modes": [], "current_mode": None, "logical": None,
+        },
+    }
+    monitors = [bm._niri_monitor_from_json(o) for o in outputs.values()]
+    assert monitors[0].to_dict() == {
+        'name': 'Dell Inc. U3421WE', 'connector': 'DP-1', 'backend': 'niri',
+        'resolution': '3440x1440', 'scale': '1.4', 'refresh_rate': '155.000',
+    }
+    assert monitors[1].name == 'eDP-1'
+    assert monitors[1]['resolution'] == 'Unknown'
+    assert monitors[1].get('scale') == '1.0'
+    assert monitors[1].get('primary', False) is False
+
+
+def test_niri_monitors_cached_until_hotplug(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    drm = tmp_path / "drm"
+    (drm / "card0-DP-1").mkdir(parents=True)
+    (drm / "card0-DP-1" / "status").write_text("connected\n")
+    monkeypatch.setattr(bm, "_DRM_SYSFS", drm)
+
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b'{"DP-1": {"name": "DP-1"}}', stderr=b'')
+
+    monkeypatch.setattr(bm.subprocess, "run", fake_run)
+    monkeypatch.setattr(bm.NiriBackend, "verify_tools", lambda self: None)
+    backend = bm.NiriBackend()
+
+    assert [m['connector'] for m in backend.get_monitors()] == ['DP-1']
+    backend.get_monitors()
+    assert len(runs) == 1
+
+    (drm / "card0-HDMI-A-1").mkdir()
+    (drm / "card0-HDMI-A-1" / "status").write_text("connected\n")
+    backend.get_monitors()
+    assert len(runs) == 2
+
+    # Scale/mode changes are invisible in sysfs, so the list also expires
+    backend._monitors_ts -= bm.NiriBackend.MONITORS_CACHE_TTL
+    backend.get_monitors()
+    assert len(runs) == 3
+
+    # Without any DRM connectors there is no fingerprint and nothing is cached
+    monkeypatch.setattr(bm, "_DRM_SYSFS", tmp_path / "no-drm")
+    backend.get_monitors()
+    backend.get_monitors()
+    assert len(runs) == 5
+
+
+def test_niri_set_wallpapers_batches_outputs(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    runs = []
+    monkeypatch.setattr(bm.subprocess, "run", lambda cmd, **kwargs: runs.append(cmd))
+    monkeypatch.setattr(bm.NiriBackend, "verify_tools", lambda self: None)
+    backend = bm.NiriBackend()
+
+    a, b = tmp_path / "a.png", tmp_path / "b.png"
+    assert backend.set_wallpapers({"DP-1": a, "DP-2": a, "HDMI-A-1": b})
+    assert len(runs) == 2
+    assert runs[0][2] == str(a)
+    assert runs[0][runs[0].index("--outputs") + 1] == "DP-1,DP-2"
+    assert runs[1][runs[1].index("--outputs") + 1] == "HDMI-A-1"
+
+
+def test_niri_current_wallpaper_follows_symlink_changes(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(bm.NiriBackend, "verify_tools", lambda self: None)
+    backend = bm.NiriBackend()
+    link = tmp_path / ".current-wallpaper"
+
+    assert backend.get_current_wallpaper() is None
+    (tmp_path / "a.png").write_bytes(b"")
+    (tmp_path / "b.png").write_bytes(b"")
+    link.symlink_to(tmp_path / "a.png")
+    assert backend.get_current_wallpaper() == tmp_path / "a.png"
+    assert backend.get_current_wallpaper() == tmp_path / "a.png"
+
+    link.unlink()
+    link.symlink_to(tmp_path / "b.png")
+    os.utime(link, ns=(0, 1), follow_symlinks=False)
+    assert backend.get_current_wallpaper() == tmp_path / "b.png"
+
+    # A dangling link is not a current wallpaper, even with the target cached
+    (tmp_path / "b.png").unlink()
+    assert backend.get_current_wallpaper() is None
+
+
+def test_plugin_backends_import_lazily(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    plugin = tmp_path / "plugin.py"
+    plugin.write_text("IMPORTED = True\nclass PluginBackend:\n    name = 'Plugin'\n")
+
+    factory = bm._LazyBackend("plugin", plugin, "PluginBackend", "Plugin")
+    assert factory._backend_class is None
+    assert factory().name == "Plugin"
+    assert factory.load() is factory.load()
+
+    missing = bm._LazyBackend("broken", plugin, "NoSuchBackend", "Broken")
+    assert missing() is None
+
+
+def test_have_is_memoized_per_path(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    lookups = []
+    monkeypatch.setattr(bm.shutil, "which", lambda tool: lookups.append(tool) or "/usr/bin/" + tool)
+
+    monkeypatch.setenv("PATH", "/usr/bin")
+    assert bm._have("awww") and bm._have("awww")
+    assert lookups == ["awww"]
+
+    monkeypatch.setenv("PATH", "/usr/local/bin:/usr/bin")
+    bm._have("awww")
+    assert lookups == ["awww", "awww"]
+
+
+def test_snapshot_collects_backend_state(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+
+    class FakeNiri:
+        name = "Niri"
+
+        def is_available(self):
+            return True
+
+        def supports_per_monitor_wallpapers(self):
+            return True
+
+        def supports_transitions(self):
+            return False
+
+        def get_monitors(self):
+            return [bm.MonitorInfo("Panel", "eDP-1", "niri")]
+
+        def get_active_monitor(self):
+            return "eDP-1"
+
+    monkeypatch.setattr(bm, "_BACKEND_CLASSES", {"niri": FakeNiri})
+    state = bm.BackendManager().snapshot()
+
+    assert state["available"] and state["name"] == "Niri"
+    assert state["supports_per_monitor"] and not state["supports_transitions"]
+    assert [m.connector for m in state["monitors"]] == ["eDP-1"]
+    assert state["active_monitor"] == "eDP-1"
+
+
+def test_backend_env_override_skips_probe(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    calls = {"init": 0, "probe": 0}
+    monkeypatch.setattr(bm, "_BACKEND_CLASSES", {"niri": make_fake_backend(calls)})
+    monkeypatch.setenv("WALLIT_BACKEND", "Niri")
+
+    manager = bm.BackendManager()
+
+    assert manager.get_backend_name() == "Niri"
+    assert calls == {"init": 1, "probe": 0}
+
+
+def test_detection_skips_backends_foreign_to_the_session(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+    monkeypatch.delenv("HYPRLAND_INSTANCE_SIGNATURE", raising=False)
+    built = []
+
+    def backend(label, available):
+        class Backend:
+            name = label
+
+            def __init__(self):
+                built.append(label)
+
+            def is_available(self):
+                return available
+
+        return Backend
+
+    monkeypatch.setattr(
+        bm, "_BACKEND_CLASSES",
+        {"niri": backend("Niri", True), "hyprland": backend("Hyprland", True), "kde": backend("KDE", True)},
+    )
+
+    assert bm.BackendManager().get_backend_name() == "Niri"
+    assert built == ["Niri"]
+
+
+def test_manager_without_backend_uses_safe_defaults(tmp_path, monkeypatch):
+    bm = load_backend_manager(tmp_path, monkeypatch)
+
+    class Unavailable:
+        name = "Niri"
+
+        def is_available(self):
+            return False
+
+    monkeypatch.setattr(bm, "_BACKEND_CLASSES", {"niri": Unavailable})
+    manager = bm.BackendManager()
+
+    assert manager.get_backend() is None
+    assert not manager.is_available()
+    assert manager.get_backend_name() == "None"
+    assert manager.get_monitors() == []
+    assert manager.get_active_monitor() is None
+    assert manager.set_wallpaper(tmp_path / "a.png") is False
+    assert manager.snapshot()["monitors"] == []
@@ -0,0 +1,293 @@
+import importlib.util
+import subprocess
+from pathlib import Path
+
+
+def load_kde_backend(tmp_path, monkeypatch):
+    """Load wall-it-kde-backend.py with HOME and XDG dirs inside tmp_path."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / ".config"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / ".cache"))
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+
+    module_path = Path(__file__).resolve().parents[1] / "wall-it-kde-backend.py"
+    spec = importlib.util.spec_from_file_location("wall_it_kde_backend_test", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module.KDEBackend, "verify_tools", lambda self: None)
+    monkeypatch.setattr(module.KDEBackend, "_check_awww_daemon", lambda self: False)
+    return module
+
+
+def test_plasma_state_is_queried_once(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    wallpaper = tmp_path / "a b.png"
+    wallpaper.write_bytes(b"")
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd)
+        stdout = (
+            "plasma_version:6.1.4\n"
+            "desktop:0:screen:1\n"
+            f"wallpaper:0:file://{wallpaper}\n"
+            "desktop:1:screen:0\n"
+            "wallpaper:1:\n"
+        )
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(kde.subprocess, "run", fake_run)
+    backend = kde.KDEBackend()
+
+    state = backend._query_plasma()
+    assert backend.check_plasma_version() == "6.1.4"
+    assert state["desktops"] == {"1": "0", "0": "1"}
+    assert state["wallpapers"]["0"] == f"file://{wallpaper}"
+    assert len(runs) == 1
+
+    backend.refresh()
+    backend._query_plasma()
+    assert len(runs) == 2
+
+    # A long-lived backend (the GUI's) picks up changes made by other processes
+    backend._plasma_ts -= kde.KDEBackend.PLASMA_STATE_TTL
+    backend._query_plasma()
+    assert len(runs) == 3
+
+
+def test_current_wallpaper_decodes_file_urls(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    wallpaper = tmp_path / "my wallpaper.png"
+    wallpaper.write_bytes(b"")
+
+    def fake_run(cmd, **kwargs):
+        if cmd[0] == "xrandr":
+            stdout = "Monitors: 1\n 0: +*DP-1 2560/597x1440/336+0+0  DP-1\n"
+        else:
+            url = "file://" + str(wallpaper).replace(" ", "%20")
+            stdout = f"desktop:0:screen:0\nwallpaper:0:{url}\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(kde.subprocess, "run", fake_run)
+    assert kde.KDEBackend().get_current_wallpaper("DP-1") == wallpaper
+
+
+def test_current_wallpaper_keeps_raw_url_characters(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    wallpaper = tmp_path / "sunset #2?.png"
+    wallpaper.write_bytes(b"")
+
+    def fake_run(cmd, **kwargs):
+        if cmd[0] == "xrandr":
+            stdout = "Monitors: 1\n 0: +*DP-1 2560/597x1440/336+0+0  DP-1\n"
+        else:
+            stdout = f"desktop:0:screen:0\nwallpaper:0:file://{wallpaper}\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(kde.subprocess, "run", fake_run)
+    assert kde.KDEBackend().get_current_wallpaper("DP-1") == wallpaper
+
+
+def test_theme_info_reads_kdeglobals(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    config = tmp_path / ".config"
+    config.mkdir()
+    (config / "kdeglobals").write_text(
+        "[General]\nColorScheme=BreezeDark\nName[de]=Dunkel\n\n[Theme]\nname=breeze-dark\n"
+    )
+
+    backend = kde.KDEBackend()
+    info = backend.get_kde_theme_info()
+    assert info == {"plasma_theme": "breeze-dark", "color_scheme": "BreezeDark"}
+    assert backend.get_kde_theme_info() == info
+
+    (config / "kdeglobals").write_text("[General]\nColorScheme=BreezeLight\n")
+    assert backend.get_kde_theme_info() == {"color_scheme": "BreezeLight"}
+
+
+def test_theme_info_survives_broken_system_kdeglobals(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    system = tmp_path / "xdg"
+    system.mkdir()
+    (system / "kdeglobals").write_text("[General]\nColorScheme=Breeze\nthis line is not a key\n")
+    monkeypatch.setenv("XDG_CONFIG_DIRS", str(system))
+    config = tmp_path / ".config"
+    config.mkdir()
+    (config / "kdeglobals").write_text("[Theme]\nname=breeze-dark\n")
+
+    info = kde.KDEBackend().get_kde_theme_info()
+    assert info == {"plasma_theme": "breeze-dark", "color_scheme": "Breeze"}
+
+
+def test_current_wallpaper_without_monitor_uses_first_desktop(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    wallpaper = tmp_path / "a.png"
+    wallpaper.write_bytes(b"")
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd[0])
+        if cmd[0] == "xrandr":
+            stdout = "Monitors: 1\n 0: +*DP-1 2560/597x1440/336+0+0  DP-1\n"
+        else:
+            stdout = f"plasma_version:6.1.4\ndesktop:0:screen:0\nwallpaper:0:file://{wallpaper}\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(kde.subprocess, "run", fake_run)
+    backend = kde.KDEBackend()
+
+    assert backend.get_current_wallpaper() == wallpaper
+    assert backend.get_current_wallpaper("DP-1") == wallpaper
+    assert backend.get_monitors()[0]["resolution"] == "2560x1440"
+    assert runs == ["xrandr", "qdbus"]
+
+
+def test_gtk_colors_replace_previous_block(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    gtk_css = tmp_path / ".config" / "gtk-3.0" / "gtk.css"
+    gtk_css.parent.mkdir(parents=True)
+    gtk_css.write_text("window { color: red; }\n")
+    backend = kde.KDEBackend()
+
+    backend._update_gtk_colors({"primary": "#111111"})
+    backend._update_gtk_colors({"primary": "#222222"})
+
+    css = gtk_css.read_text()
+    assert css.startswith("window { color: red; }\n\n/* Wall-IT Generated Colors */")
+    assert css.count("Wall-IT Generated Colors") == 1
+    assert "#222222" in css and "#111111" not in css
+
+
+def test_matugen_skipped_for_unchanged_wallpaper(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    monkeypatch.setattr(kde.KDEBackend, "_check_matugen_available", lambda self: True)
+    wallpaper = tmp_path / "a.png"
+    wallpaper.write_bytes(b"png")
+    runs = []
+
+    class FakeMatugen:
+        returncode = 0
+
+        def __init__(self, cmd, **kwargs):
+            self.args = cmd
+            runs.append(cmd)
+
+        def communicate(self, timeout=None):
+            return '{"colors": {}}', ""
+
+    monkeypatch.setattr(kde.subprocess, "Popen", FakeMatugen)
+    backend = kde.KDEBackend()
+
+    assert backend._generate_matugen_colors(wallpaper)
+    assert backend._generate_matugen_colors(wallpaper)
+    assert len(runs) == 1
+
+    (tmp_path / ".cache" / "wall-it" / "matugen_scheme").write_text("scheme-tonal-spot")
+    assert backend._generate_matugen_colors(wallpaper)
+    assert len(runs) == 2
+
+
+def test_matugen_settings_follow_file_changes(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    backend = kde.KDEBackend()
+    cache = tmp_path / ".cache" / "wall-it"
+
+    assert backend._get_matugen_scheme() == "scheme-expressive"
+    assert backend._is_matugen_enabled()
+
+    (cache / "matugen_scheme").write_text("tonal-spot\n")
+    (cache / "matugen_enabled").write_text("false")
+    assert backend._get_matugen_scheme() == "scheme-tonal-spot"
+    assert not backend._is_matugen_enabled()
+
+    (cache / "matugen_scheme").write_text("scheme-rainbow")
+    assert backend._get_matugen_scheme() == "scheme-rainbow"
+
+
+def test_monitor_list_shared_between_processes(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    drm = tmp_path / "drm"
+    (drm / "card0-DP-1").mkdir(parents=True)
+    (drm / "card0-DP-1" / "status").write_text("connected\n")
+    monkeypatch.setattr(kde, "_DRM_SYSFS", drm)
+    monkeypatch.setattr(kde, "XLIB_AVAILABLE", False)
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd[0])
+        if cmd[0] == "xrandr":
+            stdout = "Monitors: 1\n 0: +*DP-1 2560/597x1440/336+0+0  DP-1\n"
+        else:
+            stdout = "desktop:0:screen:0\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(kde.subprocess, "run", fake_run)
+
+    first = kde.KDEBackend().get_monitors()
+    assert kde.KDEBackend().get_monitors() == first
+    # The layout comes from the shared file; the desktop mapping is always asked live
+    assert runs == ["xrandr", "qdbus", "qdbus"]
+
+    (drm / "card0-DP-1" / "status").write_text("disconnected\n")
+    kde.KDEBackend().get_monitors()
+    assert runs.count("xrandr") == 2
+
+
+def test_persisted_monitor_list_expires(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    drm = tmp_path / "drm"
+    (drm / "card0-DP-1").mkdir(parents=True)
+    (drm / "card0-DP-1" / "status").write_text("connected\n")
+    monkeypatch.setattr(kde, "_DRM_SYSFS", drm)
+    monkeypatch.setattr(kde, "XLIB_AVAILABLE", False)
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd[0])
+        stdout = "Monitors: 1\n 0: +*DP-1 2560/597x1440/336+0+0  DP-1\n" if cmd[0] == "xrandr" else ""
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(kde.subprocess, "run", fake_run)
+    kde.KDEBackend().get_monitors()
+
+    # A mode change leaves sysfs untouched, so old entries must not live forever
+    now = kde.time.time()
+    monkeypatch.setattr(kde.time, "time", lambda: now + kde.KDEBackend.PERSISTED_MONITORS_TTL + 1)
+    kde.KDEBackend().get_monitors()
+    assert runs.count("xrandr") == 2
+
+
+def test_matugen_reaped_when_awww_is_missing(tmp_path, monkeypatch):
+    kde = load_kde_backend(tmp_path, monkeypatch)
+    monkeypatch.setattr(kde.KDEBackend, "_check_matugen_available", lambda self: True)
+    wallpaper = tmp_path / "a.png"
+    wallpaper.write_bytes(b"png")
+    procs = []
+
+    class FakeMatugen:
+        returncode = None
+
+        def __init__(self, cmd, **kwargs):
+            self.args = cmd
+            self.terminated = False
+            procs.append(self)
+
+        def terminate(self):
+            self.terminated = True
+
+        def communicate(self, timeout=None):
+            self.returncode = -15 if self.terminated else 0
+            return "", ""
+
+    def missing_awww(cmd, **kwargs):
+        raise FileNotFoundError(cmd[0])
+
+    monkeypatch.setattr(kde.subprocess, "Popen", FakeMatugen)
+    monkeypatch.setattr(kde.subprocess, "run", missing_awww)
+    backend = kde.KDEBackend()
+
+    try:
+        backend._set_wallpaper_awww(wallpaper)
+    except FileNotFoundError:
+        pass
+    assert procs and procs[0].terminated and procs[0].returncode is not None
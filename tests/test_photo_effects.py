@@ -0,0 +1,60 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("gi")
+pytest.importorskip("cairo")
+Image = pytest.importorskip("PIL.Image")
+ImageEnhance = pytest.importorskip("PIL.ImageEnhance")
+
+
+def load_gui():
+    """Load wallpaper-gui.py as a module (needs GTK 4 introspection data)."""
+    module_path = Path(__file__).resolve().parents[1] / "wallpaper-gui.py"
+    spec = importlib.util.spec_from_file_location("wallpaper_gui_test", module_path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except (ImportError, ValueError) as e:
+        pytest.skip(f"wallpaper-gui.py cannot be imported here: {e}")
+    return module
+
+
+def sequential(img, steps):
+    """The per-step ImageEnhance chain the fused path replaces (clamps after every step)."""
+    enhancers = {
+        "brightness": ImageEnhance.Brightness,
+        "contrast": ImageEnhance.Contrast,
+        "color": ImageEnhance.Color,
+    }
+    for op, value in steps:
+        if op == "tint":
+            luts = [[min(255, int(i * k)) for i in range(256)] for k in value]
+            img = img.point(luts[0] + luts[1] + luts[2])
+        else:
+            img = enhancers[op](img).enhance(value)
+    return img
+
+
+@pytest.mark.parametrize("steps", [
+    (("color", 2.0), ("contrast", 1.5), ("brightness", 1.1)),  # neon
+    (("contrast", 1.8), ("color", 1.3)),  # dramatic
+    (("contrast", 1.6), ("color", 1.4), ("tint", (0.9, 0.95, 1.15))),  # cyberpunk
+    (("contrast", 1.2), ("color", 0.7), ("brightness", 1.05), ("tint", (1.1, 1.05, 0.9))),  # vintage
+    (("color", 0.6), ("brightness", 1.2)),  # pastel
+])
+def test_fused_enhance_matches_sequential_chain(steps):
+    gui = load_gui()
+    # Saturated primaries and highlights are where intermediate clamping matters
+    img = Image.radial_gradient("L").resize((64, 64)).convert("RGB")
+    img.paste((255, 0, 0), (0, 0, 16, 16))
+    img.paste((250, 250, 250), (16, 0, 32, 16))
+    img.paste((0, 40, 255), (32, 0, 48, 16))
+
+    fused = gui.PhotoEffects._fused_enhance(img, *steps)
+    expected = sequential(img, steps)
+
+    worst = max(abs(a - b) for fa, ea in zip(fused.getdata(), expected.getdata())
+                for a, b in zip(fa, ea))
+    assert worst <= 3
@@ -6,12 +6,18 @@ Manages multiple desktop environment backends and auto-detects the appropriate o
 
 import os
 import sys
-import re
+import json
+import select
+import shutil
 import subprocess
+import threading
+import time
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Type
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 
 # Import configuration
 try:
@@ -24,6 +30,179 @@ except ImportError:
     config = config_module
 
 
+# Process-wide caches shared by every BackendManager instance. Backend discovery
+# imports several modules from disk and detection runs subprocess probes, so
+# both are done once per process unless BackendManager(flush_cache=True) is used.
+_BACKEND_CLASSES: Optional[Dict[str, Type]] = None
+_DETECTED_BACKEND = None
+
+
+def _session_fingerprint() -> str:
+    """Identify the graphical session so a persisted backend is only reused within it."""
+    return "|".join(
+        os.environ.get(var, '') for var in ('XDG_CURRENT_DESKTOP', 'WAYLAND_DISPLAY', 'DISPLAY')
+    )
+
+
+def _read_persisted_backend() -> Optional[str]:
+    """Return the backend name saved by a previous run in this session, if any."""
+    try:
+        name, fingerprint = config.BACKEND_CACHE_FILE.read_text().split('\n', 1)
+    except (OSError, ValueError):
+        return None
+    if fingerprint.strip() != _session_fingerprint():
+        return None
+    return name.strip() or None
+
+
+def _persist_backend(name: str):
+    """Save the detected backend name so cold-start CLI runs can skip probing."""
+    try:
+        config.BACKEND_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        config.BACKEND_CACHE_FILE.write_text(f"{name}\n{_session_fingerprint()}\n")
+    except OSError as e:
+        print(f"Warning: Could not persist backend choice: {e}", file=sys.stderr)
+
+
+@dataclass(frozen=True, slots=True)
+class MonitorInfo:
+    """A monitor as reported by a backend.
+
+    Supports item access (``monitor['connector']``, ``monitor.get('scale')``)
+    so callers written against the old dict records keep working.
+    """
+    name: str
+    connector: str
+    backend: str
+    resolution: str = 'Unknown'
+    scale: str = '1.0'
+    refresh_rate: str = '60.0'
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _niri_monitor_from_json(output: dict) -> MonitorInfo:
+    """Build a MonitorInfo from one entry of `niri msg --json outputs`."""
+    # The JSON "name" is the connector; the human-readable name is make/model/serial
+    label = ' '.join(filter(None, (output.get('make'), output.get('model'), output.get('serial'))))
+    resolution, refresh_rate, scale = 'Unknown', '60.0', '1.0'
+    current = output.get('current_mode')
+    modes = output.get('modes') or []
+    if current is not None and current < len(modes):
+        mode = modes[current]
+        resolution = f"{mode['width']}x{mode['height']}"
+        # niri reports refresh rate in millihertz
+        refresh_rate = f"{mode['refresh_rate'] / 1000:.3f}"
+    logical = output.get('logical')
+    if logical:
+        scale = f"{logical['scale']:g}"
+    return MonitorInfo(label or output['name'], output['name'], 'niri', resolution, scale, refresh_rate)
+
+
+# ((symlink path, st_mtime_ns), target) of the last ~/.current-wallpaper read
+_wallpaper_cache = None
+
+_DRM_SYSFS = Path('/sys/class/drm')
+
+
+def _drm_fingerprint() -> Optional[tuple]:
+    """Return the connection status of every DRM connector, or None if unavailable.
+
+    Reading a handful of sysfs files is far cheaper than asking the compositor,
+    and the result changes whenever a monitor is plugged or unplugged.
+    """
+    try:
+        connectors = tuple(sorted((status.parent.name, status.read_text().strip())
+                                  for status in _DRM_SYSFS.glob('*/status')))
+    except OSError:
+        return None
+    # No DRM connectors visible (container, some VMs): nothing to detect changes with
+    return connectors or None
+
+
+_which_cache: Dict[tuple, bool] = {}
+
+
+def _have(tool: str) -> bool:
+    """Return True if `tool` is on PATH (looked up in-process, memoized per PATH)"""
+    key = (tool, os.environ.get('PATH'))
+    found = _which_cache.get(key)
+    if found is None:
+        found = _which_cache[key] = shutil.which(tool) is not None
+    return found
+
+
+def _run_probe(cmd: List[str], timeout: float = 2.0) -> bool:
+    """Run a probe command and return True if it exits successfully.
+
+    On Linux 5.3+ the wait parks on a pidfd until the child exits, instead of
+    the sleep/waitpid polling loop subprocess uses for timed waits.
+    """
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        return False
+
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        pidfd = None
+
+    try:
+        if pidfd is not None:
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            if not poller.poll(int(timeout * 1000)):
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            return proc.wait() == 0
+        return proc.wait(timeout=timeout) == 0
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        return False
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+
+# Environment variables a compositor sets for its clients
+_SESSION_ENV_HINTS = {
+    'niri': 'NIRI_SOCKET',
+    'hyprland': 'HYPRLAND_INSTANCE_SIGNATURE',
+    'labwc': 'LABWC_PID',
+    'x11': 'DISPLAY',
+}
+
+
+def _session_suggests(name: str, current_desktop: str) -> bool:
+    """Cheap check (no subprocess, no backend construction) that a backend may apply"""
+    env_hint = _SESSION_ENV_HINTS.get(name)
+    return name in current_desktop or bool(env_hint and os.environ.get(env_hint))
+
+
+def _snapshot_of(backend) -> dict:
+    """Build a snapshot dict from the individual backend queries"""
+    return {
+        'available': backend.is_available(),
+        'name': backend.name,
+        'supports_per_monitor': backend.supports_per_monitor_wallpapers(),
+        'supports_transitions': backend.supports_transitions(),
+        'monitors': backend.get_monitors(),
+        'active_monitor': backend.get_active_monitor(),
+    }
+
+
 class WallpaperBackend(ABC):
     """Abstract base class for wallpaper backends"""
     
@@ -37,7 +216,7 @@ class WallpaperBackend(ABC):
         pass
     
     @abstractmethod
-    def get_monitors(self) -> List[Dict[str, str]]:
+    def get_monitors(self) -> List[MonitorInfo]:
         """Get list of available monitors"""
         pass
     
@@ -51,6 +230,11 @@ class WallpaperBackend(ABC):
         """Set wallpaper on specific monitor or all monitors"""
         pass
     
+    def set_wallpapers(self, mapping: Dict[str, Path], transition: str = 'fade', scaling: str = 'crop') -> bool:
+        """Set wallpapers on several monitors at once ({monitor: wallpaper_path})"""
+        results = [self.set_wallpaper(path, monitor, transition, scaling) for monitor, path in mapping.items()]
+        return all(results)
+    
     @abstractmethod
     def get_current_wallpaper(self, monitor: Optional[str] = None) -> Optional[Path]:
         """Get current wallpaper for specific monitor"""
@@ -66,111 +250,74 @@ class WallpaperBackend(ABC):
         """Check if the backend supports wallpaper transitions"""
         pass
 
+    def snapshot(self) -> dict:
+        """Collect availability, capabilities and monitor state in one call"""
+        return _snapshot_of(self)
+
 
 class NiriBackend(WallpaperBackend):
     """Backend for Niri Wayland compositor using awww"""
 
+    # Seconds a monitor list is reused; hotplugs invalidate it sooner, but mode and
+    # scale changes (`niri msg output ... scale`) don't show up in sysfs
+    MONITORS_CACHE_TTL = 2.0
+
     def __init__(self):
         self.name = "Niri"
+        self._monitors: Optional[List[MonitorInfo]] = None
+        self._monitors_fingerprint = None
+        self._monitors_ts = 0.0
         self.verify_tools()
 
     def verify_tools(self):
         """Verify that required tools are available"""
         required_tools = ['awww', 'niri']
-        missing_tools = []
-
-        for tool in required_tools:
-            try:
-                subprocess.run(['which', tool], check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                missing_tools.append(tool)
+        missing_tools = [tool for tool in required_tools if not _have(tool)]
 
         if missing_tools:
             print(f"Warning: Missing required tools for Niri backend: {', '.join(missing_tools)}", file=sys.stderr)
 
     def is_available(self) -> bool:
         """Check if Niri backend is available"""
-        try:
-            # Check if awww is running
-            subprocess.run(['awww', 'query'], check=True, capture_output=True)
-            # Check if niri is available
-            subprocess.run(['which', 'niri'], check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
+        # PATH lookups happen in-process; only the daemon query needs a subprocess
+        if not _have('awww') or not _have('niri'):
             return False
+        # Check if awww is running
+        return _run_probe(['awww', 'query'])
     
-    def get_monitors(self) -> List[Dict[str, str]]:
-        """Get detailed list of monitors from niri msg outputs with robust parsing."""
+    def get_monitors(self) -> List[MonitorInfo]:
+        """Get detailed list of monitors from niri msg outputs with robust parsing.
+
+        The result is cached for MONITORS_CACHE_TTL seconds, or until the DRM
+        connector status changes (hotplug).
+        """
+        fingerprint = _drm_fingerprint()
+        now = time.monotonic()
+        if (self._monitors is not None and fingerprint is not None
+                and fingerprint == self._monitors_fingerprint
+                and now - self._monitors_ts < self.MONITORS_CACHE_TTL):
+            return list(self._monitors)
+
         monitors = []
         try:
             # Get detailed monitor information from niri
-            result = subprocess.run(['niri', 'msg', 'outputs'], capture_output=True, text=True, check=True)
-            
-            current_monitor = None
-            lines = result.stdout.split('\n')
-            
-            # Regex patterns for parsing (more robust than string splitting)
-            output_pattern = re.compile(r'Output "([^"]+)" \(([^)]+)\)')
-            mode_pattern = re.compile(r'Current mode:\s*(\d+x\d+)\s*@\s*([\d.]+)')
-            scale_pattern = re.compile(r'Scale:\s*([\d.]+)')
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Parse monitor header line: Output "Monitor Name" (CONNECTOR)
-                output_match = output_pattern.search(line)
-                if output_match:
-                    # Save previous monitor before starting new one
-                    if current_monitor:
-                        monitors.append(current_monitor)
-                    
-                    monitor_name = output_match.group(1)
-                    connector = output_match.group(2)
-                    
-                    # Initialize monitor info
-                    current_monitor = {
-                        'name': monitor_name,
-                        'connector': connector,
-                        'backend': 'niri',
-                        'resolution': 'Unknown',
-                        'scale': '1.0',
-                        'refresh_rate': '60.0'
-                    }
-                    continue
-                
-                # Parse current mode line: Current mode: 3440x1440 @ 155.000 Hz
-                if current_monitor:
-                    mode_match = mode_pattern.search(line)
-                    if mode_match:
-                        current_monitor['resolution'] = mode_match.group(1)
-                        current_monitor['refresh_rate'] = mode_match.group(2)
-                        continue
-                    
-                    # Parse scale line: Scale: 1.4
-                    scale_match = scale_pattern.search(line)
-                    if scale_match:
-                        current_monitor['scale'] = scale_match.group(1)
-            
-            # Add the last monitor after parsing all lines
-            if current_monitor:
-                monitors.append(current_monitor)
+            # json.loads takes the raw bytes, so skip text-mode decoding of stdout
+            result = subprocess.run(['niri', 'msg', '--json', 'outputs'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+            monitors = [_niri_monitor_from_json(output) for output in json.loads(result.stdout).values()]
+            self._monitors = monitors
+            self._monitors_fingerprint = fingerprint
+            self._monitors_ts = now
+            monitors = list(monitors)
                 
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, ValueError) as e:
             print(f"Error getting monitors from niri: {e}", file=sys.stderr)
             # Fallback to awww query if niri command fails
             try:
-                result = subprocess.run(['awww', 'query'], capture_output=True, text=True, check=True)
+                result = subprocess.run(['awww', 'query'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
                 for line in result.stdout.strip().split('\n'):
                     if ':' in line:
                         monitor_name = line.split(':')[1].strip().split(':')[0]
-                        monitors.append({
-                            'name': monitor_name,
-                            'connector': monitor_name,
-                            'backend': 'niri',
-                            'resolution': 'Unknown',
-                            'scale': '1.0',
-                            'refresh_rate': '60.0'
-                        })
+                        monitors.append(MonitorInfo(monitor_name, monitor_name, 'niri'))
             except subprocess.CalledProcessError:
                 print("Warning: Both niri and awww monitor detection failed", file=sys.stderr)
         
@@ -179,26 +326,33 @@ class NiriBackend(WallpaperBackend):
     def get_active_monitor(self) -> Optional[str]:
         """Get currently focused monitor using Niri"""
         try:
-            result = subprocess.run(['niri', 'msg', 'focused-output'], capture_output=True, text=True, check=True)
-            output_lines = result.stdout.strip().split('\n')
-            
-            for line in output_lines:
-                if line.startswith('Output') and '(' in line and ')' in line:
-                    start_paren = line.rfind('(')
-                    end_paren = line.rfind(')')
-                    if start_paren != -1 and end_paren != -1:
-                        return line[start_paren + 1:end_paren]
-            
-            # Fallback to first monitor
-            monitors = self.get_monitors()
-            if monitors:
-                return monitors[0]['connector']
-        except subprocess.CalledProcessError as e:
+            result = subprocess.run(['niri', 'msg', '--json', 'focused-output'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+            focused = json.loads(result.stdout)
+            if focused:
+                return focused['name']
+        except (subprocess.CalledProcessError, ValueError) as e:
             print(f"Error getting active monitor: {e}", file=sys.stderr)
+
+        # Fallback to first monitor; get_monitors() reuses its cache while still valid
+        monitors = self.get_monitors()
+        if monitors:
+            return monitors[0]['connector']
         return None
     
     def set_wallpaper(self, wallpaper_path: Path, monitor: Optional[str] = None, transition: str = 'fade', scaling: str = 'crop') -> bool:
         """Set wallpaper using awww with configured parameters."""
+        return self._awww_img(wallpaper_path, [monitor] if monitor else [], transition, scaling)
+    
+    def set_wallpapers(self, mapping: Dict[str, Path], transition: str = 'fade', scaling: str = 'crop') -> bool:
+        """Set wallpapers with one awww invocation per distinct image."""
+        outputs_by_path: Dict[Path, List[str]] = {}
+        for monitor, path in mapping.items():
+            outputs_by_path.setdefault(Path(path), []).append(monitor)
+        results = [self._awww_img(path, outputs, transition, scaling) for path, outputs in outputs_by_path.items()]
+        return all(results)
+    
+    def _awww_img(self, wallpaper_path: Path, outputs: List[str], transition: str, scaling: str) -> bool:
+        """Run `awww img`, limited to the given outputs (all outputs if empty)."""
         try:
             cmd = [
                 'awww', 'img', str(wallpaper_path),
@@ -208,10 +362,10 @@ class NiriBackend(WallpaperBackend):
                 '--resize', scaling
             ]
 
-            if monitor:
-                cmd.extend(['--outputs', monitor])
+            if outputs:
+                cmd.extend(['--outputs', ','.join(outputs)])
 
-            subprocess.run(cmd, check=True, capture_output=True)
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             print(f"Wall-IT: Set wallpaper via Niri/awww with {scaling} scaling")
             return True
         except subprocess.CalledProcessError as e:
@@ -224,10 +378,21 @@ class NiriBackend(WallpaperBackend):
     
     def get_current_wallpaper(self, monitor: Optional[str] = None) -> Optional[Path]:
         """Get current wallpaper from symlink"""
+        global _wallpaper_cache
+        current_link = os.path.join(os.path.expanduser('~'), '.current-wallpaper')
         try:
-            current_link = Path.home() / ".current-wallpaper"
-            if current_link.exists():
-                return Path(current_link.readlink())
+            # lstat doubles as the existence check and as the cache key
+            mtime_ns = os.lstat(current_link).st_mtime_ns
+            if _wallpaper_cache is not None and _wallpaper_cache[0] == (current_link, mtime_ns):
+                target = _wallpaper_cache[1]
+            else:
+                target = Path(os.readlink(current_link))
+                _wallpaper_cache = ((current_link, mtime_ns), target)
+            # The link itself may outlive its target (wallpaper deleted or moved)
+            if os.path.exists(current_link):
+                return target
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Error getting current wallpaper: {e}", file=sys.stderr)
         return None
@@ -239,84 +404,158 @@ class NiriBackend(WallpaperBackend):
         return True
 
 
+class _NullBackend(WallpaperBackend):
+    """Stand-in used when no backend is available; every operation is a no-op"""
+
+    def __init__(self):
+        self.name = "None"
+
+    def is_available(self) -> bool:
+        return False
+
+    def get_monitors(self) -> List[MonitorInfo]:
+        return []
+
+    def get_active_monitor(self) -> Optional[str]:
+        return None
+
+    def set_wallpaper(self, wallpaper_path: Path, monitor: Optional[str] = None, transition: str = 'fade', scaling: str = 'crop') -> bool:
+        return False
+
+    def set_wallpapers(self, mapping: Dict[str, Path], transition: str = 'fade', scaling: str = 'crop') -> bool:
+        return False
+
+    def get_current_wallpaper(self, monitor: Optional[str] = None) -> Optional[Path]:
+        return None
+
+    def supports_per_monitor_wallpapers(self) -> bool:
+        return False
+
+    def supports_transitions(self) -> bool:
+        return False
+
+
+# key -> (file name, class name, display label) of backends living in their own module
+_PLUGIN_BACKENDS = {
+    'x11': ("wall-it-x11-backend.py", "X11Backend", "X11"),
+    'kde': ("wall-it-kde-backend.py", "KDEBackend", "KDE"),
+    'hyprland': ("wall-it-hyprland-backend.py", "HyprlandBackend", "Hyprland"),
+    'labwc': ("wall-it-labwc-backend.py", "LabwcBackend", "Labwc"),
+}
+
+
+class _LazyBackend:
+    """Backend factory that imports its module on first use"""
+
+    def __init__(self, key: str, path: Path, class_name: str, label: str):
+        self.key = key
+        self.path = path
+        self.class_name = class_name
+        self.label = label
+        self._backend_class = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[Type]:
+        """Import the backend module once and return its backend class"""
+        with self._lock:
+            if self._backend_class is None:
+                try:
+                    spec = importlib.util.spec_from_file_location(f"{self.key}_backend", self.path)
+                    module = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    self._backend_class = getattr(module, self.class_name)
+                except ImportError as e:
+                    print(f"Info: {self.label} backend import failed: {e}", file=sys.stderr)
+                except Exception as e:
+                    print(f"Warning: Failed to load {self.label} backend: {type(e).__name__}: {e}", file=sys.stderr)
+            return self._backend_class
+
+    def __call__(self):
+        backend_class = self.load()
+        return backend_class() if backend_class is not None else None
+
+
 class BackendManager:
     """Manages wallpaper backends and auto-detects the appropriate one"""
     
-    def __init__(self):
+    def __init__(self, flush_cache: bool = False):
+        global _BACKEND_CLASSES, _DETECTED_BACKEND
+        if flush_cache:
+            _BACKEND_CLASSES = None
+            _DETECTED_BACKEND = None
+            try:
+                config.BACKEND_CACHE_FILE.unlink()
+            except OSError:
+                pass
+
         self.backends = {}
         self._active_backend = None
         self._load_backends()
         self._detect_backend()
+        if self._active_backend is None:
+            self._active_backend = _NullBackend()
     
     def _load_backends(self):
-        """Load all available backends"""
+        """Load all available backends (once per process)"""
+        global _BACKEND_CLASSES
+        if _BACKEND_CLASSES is None:
+            self._discover_backends()
+            _BACKEND_CLASSES = dict(self.backends)
+        else:
+            self.backends = dict(_BACKEND_CLASSES)
+
+    def _discover_backends(self):
+        """Register every backend module found next to this file.
+
+        Plugin modules are only imported when their backend is first
+        instantiated, so sessions that settle on Niri never pay for them.
+        """
         # Register Niri backend first
         self.backends['niri'] = NiriBackend
 
-        # Import X11/Openbox backend
-        try:
-            x11_backend_path = Path(__file__).parent / "wall-it-x11-backend.py"
-            if x11_backend_path.exists():
-                spec = importlib.util.spec_from_file_location("x11_backend", x11_backend_path)
-                x11_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(x11_module)
-                self.backends['x11'] = x11_module.X11Backend
+        for key, (filename, class_name, label) in _PLUGIN_BACKENDS.items():
+            backend_path = Path(__file__).parent / filename
+            if backend_path.exists():
+                self.backends[key] = _LazyBackend(key, backend_path, class_name, label)
             else:
-                print(f"Info: X11 backend file not found at {x11_backend_path}", file=sys.stderr)
-        except ImportError as e:
-            print(f"Info: X11 backend import failed: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: Failed to load X11 backend: {type(e).__name__}: {e}", file=sys.stderr)
+                print(f"Info: {label} backend file not found at {backend_path}", file=sys.stderr)
+    
+    def _detect_backend(self):
+        """Auto-detect the appropriate backend, reusing cached results when possible"""
+        global _DETECTED_BACKEND
+        if _DETECTED_BACKEND is not None:
+            self._active_backend = _DETECTED_BACKEND
+            return
 
-        # Import KDE backend
-        try:
-            kde_backend_path = Path(__file__).parent / "wall-it-kde-backend.py"
-            if kde_backend_path.exists():
-                spec = importlib.util.spec_from_file_location("kde_backend", kde_backend_path)
-                kde_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(kde_module)
-                self.backends['kde'] = kde_module.KDEBackend
+        # An explicit user choice skips probing entirely
+        forced = os.environ.get('WALLIT_BACKEND', '').strip().lower()
+        if forced:
+            if forced in self.backends:
+                try:
+                    backend = self.backends[forced]()
+                    if backend is not None:
+                        self._active_backend = backend
+                        _DETECTED_BACKEND = backend
+                        print(f"Wall-IT: Using {forced.upper()} backend (WALLIT_BACKEND)")
+                        return
+                except Exception as e:
+                    print(f"Warning: Requested {forced} backend failed to load: {e}", file=sys.stderr)
             else:
-                print(f"Info: KDE backend file not found at {kde_backend_path}", file=sys.stderr)
-        except ImportError as e:
-            print(f"Info: KDE backend import failed: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: Failed to load KDE backend: {type(e).__name__}: {e}", file=sys.stderr)
+                print(f"Warning: Unknown backend '{forced}' in WALLIT_BACKEND, auto-detecting", file=sys.stderr)
 
-        # Import Hyprland backend
-        try:
-            hyprland_backend_path = Path(__file__).parent / "wall-it-hyprland-backend.py"
-            if hyprland_backend_path.exists():
-                spec = importlib.util.spec_from_file_location("hyprland_backend", hyprland_backend_path)
-                hyprland_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(hyprland_module)
-                self.backends['hyprland'] = hyprland_module.HyprlandBackend
-            else:
-                print(f"Info: Hyprland backend file not found at {hyprland_backend_path}", file=sys.stderr)
-        except ImportError as e:
-            print(f"Info: Hyprland backend import failed: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: Failed to load Hyprland backend: {type(e).__name__}: {e}", file=sys.stderr)
+        # A previous run in this session already probed; trust its answer.
+        persisted = _read_persisted_backend()
+        if persisted in self.backends:
+            try:
+                backend = self.backends[persisted]()
+                if backend is not None:
+                    self._active_backend = backend
+                    _DETECTED_BACKEND = backend
+                    return
+            except Exception as e:
+                print(f"Warning: Cached {persisted} backend failed to load: {e}", file=sys.stderr)
 
-        # Import Labwc backend
-        try:
-            labwc_backend_path = Path(__file__).parent / "wall-it-labwc-backend.py"
-            if labwc_backend_path.exists():
-                spec = importlib.util.spec_from_file_location("labwc_backend", labwc_backend_path)
-                labwc_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(labwc_module)
-                self.backends['labwc'] = labwc_module.LabwcBackend
-            else:
-                print(f"Info: Labwc backend file not found at {labwc_backend_path}", file=sys.stderr)
-        except ImportError as e:
-            print(f"Info: Labwc backend import failed: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: Failed to load Labwc backend: {type(e).__name__}: {e}", file=sys.stderr)
-    
-    def _detect_backend(self):
-        """Auto-detect the appropriate backend"""
         # Check desktop environment first to prioritize the correct backend
-        import os
         current_desktop = os.environ.get('XDG_CURRENT_DESKTOP', '').lower()
         wayland_display = os.environ.get('WAYLAND_DISPLAY', '')
         x11_display = os.environ.get('DISPLAY', '')
@@ -333,7 +572,7 @@ class BackendManager:
             preferred_order = ['hyprland', 'niri', 'kde', 'labwc']
         elif 'labwc' in current_desktop.lower() or (
             'wlroots' in current_desktop.lower() and
-            subprocess.run(['pgrep', 'labwc'], capture_output=True).returncode == 0
+            subprocess.run(['pgrep', 'labwc'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
         ):
             preferred_order = ['labwc', 'niri', 'kde', 'hyprland']
         elif 'niri' in current_desktop.lower():
@@ -344,89 +583,89 @@ class BackendManager:
             # Default order: try Niri first (since it's mentioned in the project name), then others
             preferred_order = ['niri', 'hyprland', 'kde', 'labwc', 'x11']
         
-        # Try backends in preferred order
-        for name in preferred_order:
-            if name in self.backends:
-                try:
-                    backend_class = self.backends[name]
-                    backend = backend_class()
-                    if backend.is_available():
-                        self._active_backend = backend
-                        print(f"Wall-IT: Using {name.upper()} backend")
-                        return
-                except Exception as e:
-                    print(f"Warning: Error testing {name} backend: {e}", file=sys.stderr)
+        # Probe the backends the session environment points at concurrently (each
+        # probe mostly waits on child processes); constructing the others would run
+        # their tool checks and print warnings, so they are only tried one at a
+        # time, in order, if none of those is available
+        candidates = [name for name in preferred_order if name in self.backends]
+        plausible = [name for name in candidates if _session_suggests(name, current_desktop)]
+        results = {}
+        if plausible:
+            with ThreadPoolExecutor(max_workers=len(plausible)) as executor:
+                results = dict(zip(plausible, executor.map(self._probe_backend, plausible)))
+        fallbacks = [name for name in candidates if name not in results]
+        for name in plausible + fallbacks:
+            backend = results[name] if name in results else self._probe_backend(name)
+            if backend is not None:
+                self._active_backend = backend
+                _DETECTED_BACKEND = backend
+                _persist_backend(name)
+                print(f"Wall-IT: Using {name.upper()} backend")
+                return
 
         print("Error: No compatible wallpaper backend found!", file=sys.stderr)
+
+    def _probe_backend(self, name: str) -> Optional[WallpaperBackend]:
+        """Instantiate a backend and return it if it is available"""
+        try:
+            backend = self.backends[name]()
+            if backend is not None and backend.is_available():
+                return backend
+        except Exception as e:
+            print(f"Warning: Error testing {name} backend: {e}", file=sys.stderr)
+        return None
     
     def get_backend(self) -> Optional[WallpaperBackend]:
         """Get the active backend"""
+        if isinstance(self._active_backend, _NullBackend):
+            return None
         return self._active_backend
     
     def is_available(self) -> bool:
         """Check if any backend is available"""
-        return self._active_backend is not None
+        return not isinstance(self._active_backend, _NullBackend)
     
     def get_backend_name(self) -> str:
         """Get the name of the active backend"""
-        if self._active_backend:
-            return self._active_backend.name
-        return "None"
-    
-    # Proxy methods to active backend
-    def get_monitors(self) -> List[Dict[str, str]]:
-        """Get list of available monitors"""
-        if self._active_backend:
-            return self._active_backend.get_monitors()
-        return []
-    
-    def get_active_monitor(self) -> Optional[str]:
-        """Get the currently active monitor"""
-        if self._active_backend:
-            return self._active_backend.get_active_monitor()
-        return None
+        return self._active_backend.name
     
-    def set_wallpaper(self, wallpaper_path: Path, monitor: Optional[str] = None, transition: str = 'fade', scaling: str = 'crop') -> bool:
-        """Set wallpaper"""
-        if self._active_backend:
-            return self._active_backend.set_wallpaper(wallpaper_path, monitor, transition, scaling)
-        return False
+    def set_wallpapers(self, mapping: Dict[str, Path], transition: str = 'fade', scaling: str = 'crop') -> bool:
+        """Set wallpapers on several monitors ({monitor: wallpaper_path})"""
+        if hasattr(self._active_backend, 'set_wallpapers'):
+            return self._active_backend.set_wallpapers(mapping, transition, scaling)
+        results = [self._active_backend.set_wallpaper(path, monitor, transition, scaling)
+                   for monitor, path in mapping.items()]
+        return all(results)
     
-    def get_current_wallpaper(self, monitor: Optional[str] = None) -> Optional[Path]:
-        """Get current wallpaper"""
-        if self._active_backend:
-            return self._active_backend.get_current_wallpaper(monitor)
-        return None
+    def snapshot(self) -> dict:
+        """Get availability, capabilities and monitors of the active backend at once"""
+        if hasattr(self._active_backend, 'snapshot'):
+            return self._active_backend.snapshot()
+        return _snapshot_of(self._active_backend)
     
-    def supports_per_monitor_wallpapers(self) -> bool:
-        """Check if per-monitor wallpapers are supported"""
-        if self._active_backend:
-            return self._active_backend.supports_per_monitor_wallpapers()
-        return False
-    
-    def supports_transitions(self) -> bool:
-        """Check if transitions are supported"""
-        if self._active_backend:
-            return self._active_backend.supports_transitions()
-        return False
+    def __getattr__(self, name):
+        """Forward everything else (get_monitors, set_wallpaper, ...) to the active backend"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._active_backend, name)
 
 
 def test_backend_manager():
     """Test the backend manager"""
     manager = BackendManager()
+    state = manager.snapshot()
     
-    print(f"Backend Available: {manager.is_available()}")
-    print(f"Backend Name: {manager.get_backend_name()}")
-    print(f"Supports Per-Monitor: {manager.supports_per_monitor_wallpapers()}")
-    print(f"Supports Transitions: {manager.supports_transitions()}")
+    print(f"Backend Available: {state['available']}")
+    print(f"Backend Name: {state['name']}")
+    print(f"Supports Per-Monitor: {state['supports_per_monitor']}")
+    print(f"Supports Transitions: {state['supports_transitions']}")
     
-    monitors = manager.get_monitors()
+    monitors = state['monitors']
     print(f"Monitors ({len(monitors)}):")
     for monitor in monitors:
         print(f"  {monitor}")
     
-    active = manager.get_active_monitor()
-    print(f"Active Monitor: {active}")
+    print(f"Active Monitor: {state['active_monitor']}")
 
 
 if __name__ == "__main__":
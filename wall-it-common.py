@@ -324,13 +324,20 @@ def apply_fit_blur(image_path: Path) -> Path:
         return image_path
 
 
+_backend_module = None
+
+
 def get_backend_manager():
     """Get backend manager instance."""
-    backend_path = Path(__file__).parent / "wall-it-backend-manager.py"
-    spec = importlib.util.spec_from_file_location("backend_manager", backend_path)
-    backend_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(backend_module)
-    return backend_module.BackendManager()
+    global _backend_module
+    # Load the module once so its backend/detection caches survive between calls
+    if _backend_module is None:
+        backend_path = Path(__file__).parent / "wall-it-backend-manager.py"
+        spec = importlib.util.spec_from_file_location("backend_manager", backend_path)
+        backend_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(backend_module)
+        _backend_module = backend_module
+    return _backend_module.BackendManager()
 
 
 def get_active_monitor(backend_manager=None) -> Optional[str]:
@@ -30,6 +30,7 @@ EFFECT_FILE = CACHE_DIR / "current_effect"
 SCALING_FILE = CACHE_DIR / "wallpaper_scaling"
 KEYBIND_MODE_FILE = CACHE_DIR / "keybind_mode"
 MONITOR_STATE_FILE = CACHE_DIR / "monitor_state.json"
+BACKEND_CACHE_FILE = CACHE_DIR / "backend"
 TEMP_DIR = CACHE_DIR / "temp"
 LOG_FILE = CACHE_DIR / "launcher.log"
 
@@ -5,136 +5,307 @@ Provides KDE/Plasma-specific functionality for wallpaper management
 """
 
 import os
+import re
+import configparser
+import shutil
 import subprocess
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+# Optional: query XRandR in-process instead of running xrandr
+try:
+    from Xlib import display as xdisplay
+    from Xlib.ext import randr  # noqa: F401  (registers the RandR request methods)
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+
+# Monitor geometry in `xrandr --listmonitors` output, e.g. "4763/920x1994/430+0+0"
+_XRANDR_RES_RE = re.compile(r'^(\d+)/\d+x(\d+)/\d+')
+
+# The block _update_gtk_colors appends to gtk.css
+_WALLIT_BLOCK_RE = re.compile(rb'/\*\s*Wall-IT Generated Colors\s*\*/[^{]*\{[^}]*\}\s*')
+
+# Per-session monitor list shared between processes (None without a runtime dir)
+_MONITORS_FILE = (Path(os.environ['XDG_RUNTIME_DIR']) / "wall-it" / "kde-monitors.json"
+                  if os.environ.get('XDG_RUNTIME_DIR') else None)
+_DRM_SYSFS = Path('/sys/class/drm')
+
+
+def _monitor_generation() -> Optional[list]:
+    """Token that changes when monitors are plugged/unplugged or the display session changes.
+
+    Built from the DRM connector status files in sysfs; None if they can't be read,
+    in which case the persisted monitor list is not used.
+    """
+    try:
+        connectors = sorted([status.parent.name, status.read_text().strip()]
+                            for status in _DRM_SYSFS.glob('*/status'))
+    except OSError:
+        return None
+    if not connectors:
+        return None
+    return [os.environ.get('DISPLAY', ''), os.environ.get('WAYLAND_DISPLAY', ''), connectors]
+
+
+# Everything we read from Plasma, gathered in a single evaluateScript round-trip
+_BATCH_SCRIPT = """
+print("plasma_version:" + applicationVersion);
+var ds = desktops();
+for (var i = 0; i < ds.length; i++) {
+    var d = ds[i];
+    print("desktop:" + i + ":screen:" + d.screen);
+    d.currentConfigGroup = ["Wallpaper", "org.kde.image", "General"];
+    print("wallpaper:" + i + ":" + d.readConfig("Image"));
+}
+"""
 
 
 class KDEBackend:
     """Backend for KDE/Plasma desktop environment"""
+
+    # Seconds a get_monitors() result is reused before xrandr is asked again
+    MONITORS_CACHE_TTL = 1.0
+    # Seconds the batched Plasma state is trusted; wall-it-next or KDE's own settings
+    # can change wallpapers behind a long-lived backend
+    PLASMA_STATE_TTL = 2.0
+    # Seconds another process's saved monitor list stays usable; connector status
+    # in sysfs does not change on a mode or primary-output switch
+    PERSISTED_MONITORS_TTL = 5.0
+
+    # (tool name, PATH) -> resolved path (or None), shared by every instance
+    _which_cache: Dict[tuple, Optional[str]] = {}
     
     def __init__(self):
         self.name = "KDE"
-        self.verify_tools()
-        self.awww_available = self._check_awww_daemon()
+        self._plasma_state: Optional[Dict] = None
+        self._plasma_ts = 0.0
+        self._monitors_cache: Optional[List[Dict[str, str]]] = None
+        self._monitors_ts = 0.0
+        self._display = None  # Xlib connection, opened on first monitor query (False if unusable)
+        self._colors_cache: Optional[tuple] = None
+        self._theme_cache: Optional[tuple] = None
+        self._settings_cache: Dict[str, tuple] = {}  # setting name -> ((mtime_ns, size), value)
+        # Resolve per-user paths once instead of on every color update
+        home = Path.home()
+        self._cache_dir = home / ".cache" / "wall-it"
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._gtk_css = home / ".config" / "gtk-3.0" / "gtk.css"
+        # Probed on first use so constructing the backend (e.g. just to call is_available) is cheap
+        self._awww_available: Optional[bool] = None
+        self._tools_verified = False
+
+    @property
+    def awww_available(self) -> bool:
+        """Whether the awww daemon is running (checked once, on first access)"""
+        if self._awww_available is None:
+            self._awww_available = self._check_awww_daemon()
+        return self._awww_available
 
     def verify_tools(self):
         """Verify that required KDE tools are available"""
         required_tools = ['qdbus', 'plasma-apply-wallpaperimage', 'xrandr']
-        missing_tools = []
-
-        for tool in required_tools:
-            try:
-                subprocess.run(['which', tool], check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                missing_tools.append(tool)
+        missing_tools = [tool for tool in required_tools if self._which(tool) is None]
 
         if missing_tools:
             print(f"Warning: Missing required tools for KDE backend: {', '.join(missing_tools)}", file=sys.stderr)
 
+    @classmethod
+    def _which(cls, tool: str) -> Optional[str]:
+        """Look up a tool on PATH once and remember the result until PATH changes"""
+        key = (tool, os.environ.get('PATH'))
+        if key not in cls._which_cache:
+            cls._which_cache[key] = shutil.which(tool)
+        return cls._which_cache[key]
+
     def _check_awww_daemon(self) -> bool:
         """Check if awww daemon is running for hybrid transition support"""
+        if self._which('awww') is None:
+            return False
         try:
-            result = subprocess.run(['awww', 'query'], capture_output=True, text=True, timeout=2)
+            result = subprocess.run(['awww', 'query'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=2)
             return result.returncode == 0
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
     def is_available(self) -> bool:
         """Check if KDE backend is available on this system"""
+        # Check if we're running KDE
+        current_desktop = os.environ.get('XDG_CURRENT_DESKTOP', '')
+        if 'KDE' not in current_desktop:
+            return False
+        
+        # Check if plasma is running
         try:
-            # Check if we're running KDE
-            import os
-            current_desktop = os.environ.get('XDG_CURRENT_DESKTOP', '')
-            if 'KDE' not in current_desktop:
-                return False
-            
-            # Check if plasma is running
-            subprocess.run(['qdbus', 'org.kde.plasmashell'], check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
+            result = subprocess.run(['qdbus', 'org.kde.plasmashell'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+            return result.returncode == 0
+        except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
+    def _query_plasma(self) -> Dict:
+        """Return Plasma version, desktop->screen mapping and wallpapers (cached briefly)"""
+        now = time.monotonic()
+        if self._plasma_state is not None and now - self._plasma_ts < self.PLASMA_STATE_TTL:
+            return self._plasma_state
+        
+        state = {'plasma_version': None, 'desktops': {}, 'wallpapers': {}}
+        try:
+            result = subprocess.run([
+                'qdbus', 'org.kde.plasmashell', '/PlasmaShell', 'org.kde.PlasmaShell.evaluateScript', _BATCH_SCRIPT
+            ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True, timeout=5)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+            return state
+        
+        for line in result.stdout.splitlines():
+            key, _, rest = line.partition(':')
+            if key == 'plasma_version':
+                state['plasma_version'] = rest.strip()
+            elif key == 'desktop':
+                desktop_id, _, screen_id = rest.partition(':screen:')
+                state['desktops'][screen_id.strip()] = desktop_id
+            elif key == 'wallpaper':
+                desktop_id, _, url = rest.partition(':')
+                state['wallpapers'][desktop_id] = url.strip()
+        
+        self._plasma_state = state
+        self._plasma_ts = now
+        return state
+    
+    def refresh(self):
+        """Forget cached Plasma state and monitors so the next query starts fresh"""
+        self._plasma_state = None
+        self._monitors_cache = None
+    
     def get_monitors(self) -> List[Dict[str, str]]:
-        """Get list of available monitors with their properties"""
+        """Get list of available monitors with their properties (cached briefly)"""
+        now = time.monotonic()
+        if self._monitors_cache is None or now - self._monitors_ts >= self.MONITORS_CACHE_TTL:
+            # An XRandR request is as cheap as reading the shared file, and always current
+            monitors = self._xlib_monitors()
+            if monitors is None:
+                token = _monitor_generation()
+                monitors = self._load_persisted_monitors(token)
+                if monitors is None:
+                    monitors = self._xrandr_monitors_or_empty()
+                    self._persist_monitors(token, monitors)
+            self._monitors_cache = self._with_desktop_ids(monitors)
+            self._monitors_ts = now
+        return list(self._monitors_cache)
+    
+    def _load_persisted_monitors(self, token: Optional[list]) -> Optional[List[Dict[str, str]]]:
+        """Monitors saved by an earlier process in this session, if the hardware is unchanged"""
+        if token is None or _MONITORS_FILE is None:
+            return None
+        try:
+            data = json.loads(_MONITORS_FILE.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('generation') != token:
+            return None
+        if not 0 <= time.time() - data.get('saved', 0) < self.PERSISTED_MONITORS_TTL:
+            return None
+        return data.get('monitors')
+    
+    def _persist_monitors(self, token: Optional[list], monitors: List[Dict[str, str]]):
+        """Save the monitor list for the next short-lived process (wall-it-next/prev)"""
+        if token is None or _MONITORS_FILE is None or not monitors:
+            return
+        try:
+            _MONITORS_FILE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_file = _MONITORS_FILE.with_suffix('.tmp')
+            tmp_file.write_text(json.dumps({'generation': token, 'saved': time.time(),
+                                            'monitors': monitors}))
+            os.replace(tmp_file, _MONITORS_FILE)
+        except OSError as e:
+            print(f"Warning: Could not persist monitor list: {e}", file=sys.stderr)
+    
+    def _xrandr_monitors_or_empty(self) -> List[Dict[str, str]]:
+        """Monitor layout from the xrandr command, [] if it fails"""
+        try:
+            return self._xrandr_monitors()
+        except subprocess.CalledProcessError as e:
+            print(f"Error getting monitors: {e}", file=sys.stderr)
+            return []
+    
+    def _with_desktop_ids(self, monitors: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Attach Plasma's current desktop for each screen (never taken from the shared file)"""
+        # Falls back to desktop IDs in monitor order
+        desktop_info = self._query_plasma()['desktops']
+        return [dict(monitor, kde_desktop_id=desktop_info.get(str(i), str(i)))
+                for i, monitor in enumerate(monitors)]
+    
+    def _xlib_monitors(self) -> Optional[List[Dict[str, str]]]:
+        """List monitors via XRandR 1.5 (same data as `xrandr --listmonitors`), or None"""
+        if not XLIB_AVAILABLE or self._display is False:
+            return None
+        try:
+            if self._display is None:
+                self._display = xdisplay.Display()
+            root = self._display.screen().root
+            reply = root.xrandr_get_monitors(is_active=True)
+            monitors = []
+            for index, info in enumerate(reply.monitors):
+                connector = self._display.get_atom_name(info.name)
+                monitors.append({
+                    'id': str(index),
+                    'name': connector,
+                    'connector': connector,
+                    'resolution': f"{info.width_in_pixels}x{info.height_in_pixels}",
+                    'primary': bool(info.primary)
+                })
+            return monitors
+        except Exception as e:
+            # No X server, RandR < 1.5, ... -- use the xrandr command from now on
+            print(f"Info: XRandR query failed, using xrandr: {e}", file=sys.stderr)
+            self._display = False
+            return None
+    
+    def _xlib_primary_output(self) -> Optional[str]:
+        """Name of the primary RandR output in two X requests, or None"""
+        if not XLIB_AVAILABLE or self._display is False:
+            return None
+        try:
+            if self._display is None:
+                self._display = xdisplay.Display()
+            root = self._display.screen().root
+            output = root.xrandr_get_output_primary().output
+            if not output:
+                return None
+            timestamp = root.xrandr_get_screen_resources_current().config_timestamp
+            return self._display.xrandr_get_output_info(output, timestamp).name
+        except Exception:
+            return None
+    
+    def _xrandr_monitors(self) -> List[Dict[str, str]]:
+        """List monitors by parsing `xrandr --listmonitors`"""
         monitors = []
+        result = subprocess.run(['xrandr', '--listmonitors'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
+        lines = result.stdout.strip().split('\n')[1:]  # Skip header line
         
-        try:
-            # Get monitor information from xrandr
-            result = subprocess.run(['xrandr', '--listmonitors'], capture_output=True, text=True, check=True)
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header line
+        for line in lines:
+            parts = line.split()
+            if len(parts) < 3 or not parts[0].endswith(':'):
+                continue
+            monitor_id = parts[0].rstrip(':')
+            monitor_name = parts[-1]  # Last part is usually the connector name
             
-            for line in lines:
-                if ':' in line:
-                    parts = line.strip().split()
-                    monitor_id = parts[0].rstrip(':')
-                    monitor_name = parts[-1]  # Last part is usually the connector name
-                    
-                    # Extract resolution and position from the format like "+*DP-1 4763/920x1994/430+0+0  DP-1"
-                    if 'x' in line and len(parts) >= 3:
-                        res_part = parts[2]  # Get the resolution part (third element)
-                        resolution_info = "Unknown"
-                        
-                        # Try to parse resolution from format like "4763/920x1994/430+0+0"
-                        if 'x' in res_part:
-                            try:
-                                # Format: WIDTH/PHYSICALxHEIGHT/PHYSICAL+X+Y
-                                # We want to extract the logical resolution (first numbers)
-                                import re
-                                match = re.match(r'[+*]?(\d+)/\d+x(\d+)/\d+', res_part)
-                                if match:
-                                    width, height = match.groups()
-                                    resolution_info = f"{width}x{height}"
-                                else:
-                                    # Fallback parsing
-                                    x_parts = res_part.split('x')
-                                    if len(x_parts) >= 2:
-                                        width = x_parts[0].split('/')[-1].lstrip('+*')
-                                        height = x_parts[1].split('/')[0].split('+')[0]
-                                        resolution_info = f"{width}x{height}"
-                            except Exception:
-                                resolution_info = "Unknown"
-                        
-                        # Check if this is the primary monitor (look in the original line for *)
-                        is_primary = '*' in line
-                        
-                        monitors.append({
-                            'id': monitor_id,
-                            'name': monitor_name,
-                            'connector': monitor_name,
-                            'resolution': resolution_info,
-                            'primary': is_primary
-                        })
+            # Logical resolution from "4763/920x1994/430+0+0" (WIDTH/PHYSICALxHEIGHT/PHYSICAL+X+Y)
+            match = _XRANDR_RES_RE.match(parts[2])
+            resolution_info = f"{match.group(1)}x{match.group(2)}" if match else "Unknown"
             
-            # Also get KDE desktop information
-            try:
-                result = subprocess.run([
-                    'qdbus', 'org.kde.plasmashell', '/PlasmaShell', 'org.kde.PlasmaShell.evaluateScript',
-                    'for (i = 0; i < desktops().length; i++) { d = desktops()[i]; print("desktop:" + i + ":screen:" + d.screen); }'
-                ], capture_output=True, text=True, check=True)
-                
-                desktop_info = {}
-                for line in result.stdout.strip().split('\n'):
-                    if 'desktop:' in line and 'screen:' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 4:
-                            desktop_id = parts[1]
-                            screen_id = parts[3]
-                            desktop_info[screen_id] = desktop_id
-                
-                # Add desktop info to monitors
-                for i, monitor in enumerate(monitors):
-                    monitor['kde_desktop_id'] = desktop_info.get(str(i), str(i))
-                    
-            except subprocess.CalledProcessError:
-                # Fallback: assign desktop IDs based on order
-                for i, monitor in enumerate(monitors):
-                    monitor['kde_desktop_id'] = str(i)
-                    
-        except subprocess.CalledProcessError as e:
-            print(f"Error getting monitors: {e}", file=sys.stderr)
+            monitors.append({
+                'id': monitor_id,
+                'name': monitor_name,
+                'connector': monitor_name,
+                'resolution': resolution_info,
+                # "+*DP-1" marks the primary monitor
+                'primary': '*' in parts[1]
+            })
         
         return monitors
     
@@ -143,6 +314,12 @@ class KDEBackend:
         try:
             # In KDE, we can try to detect the active monitor by looking at mouse position
             # or current window focus, but this is complex. For now, we'll use the primary monitor
+            cache_warm = (self._monitors_cache is not None and
+                          time.monotonic() - self._monitors_ts < self.MONITORS_CACHE_TTL)
+            if not cache_warm:
+                primary = self._xlib_primary_output()
+                if primary:
+                    return primary
             monitors = self.get_monitors()
             
             # First try to find primary monitor
@@ -169,6 +346,9 @@ class KDEBackend:
     
     def set_wallpaper(self, wallpaper_path: Path, monitor: Optional[str] = None, transition: str = 'fade', scaling: str = 'crop') -> bool:
         """Set wallpaper on specific monitor or all monitors (hybrid KDE+awww approach)"""
+        if not self._tools_verified:
+            self.verify_tools()
+            self._tools_verified = True
         try:
             # Hybrid approach: Use awww for transitions if available, KDE for monitor-specific control
             if self.awww_available and transition != 'none':
@@ -179,13 +359,15 @@ class KDEBackend:
         except Exception as e:
             print(f"Error setting wallpaper: {e}", file=sys.stderr)
             return False
+        finally:
+            # The wallpaper read back from Plasma is now stale
+            self._plasma_state = None
 
     def _set_wallpaper_awww(self, wallpaper_path: Path, monitor: Optional[str] = None, transition: str = 'fade', scaling: str = 'crop') -> bool:
         """Set wallpaper using awww for beautiful transitions with matugen support"""
+        # matugen only reads the image, so let it run while awww transitions
+        matugen_job = self._start_matugen(wallpaper_path)
         try:
-            # Generate colors with matugen first (before setting wallpaper)
-            matugen_success = self._generate_matugen_colors(wallpaper_path)
-
             cmd = ['awww', 'img', str(wallpaper_path)]
 
             # Add transition settings
@@ -206,29 +388,32 @@ class KDEBackend:
             else:
                 print(f"Wall-IT: Setting wallpaper on all monitors with {transition} transition (awww)")
 
-            if matugen_success:
-                print(f"Wall-IT: Generated dynamic colors with matugen")
-
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
 
             # Apply KDE-specific color integration if matugen succeeded
-            if matugen_success:
+            if self._finish_matugen(matugen_job):
+                print(f"Wall-IT: Generated dynamic colors with matugen")
                 self._apply_kde_colors()
 
             return True
 
         except subprocess.CalledProcessError as e:
+            # Let matugen finish so the native fallback finds its colors cached
+            self._finish_matugen(matugen_job)
             error_msg = e.stderr if e.stderr else str(e)
             print(f"Error setting wallpaper with awww: {error_msg}", file=sys.stderr)
             # Fallback to KDE native method
             print("Falling back to KDE native wallpaper setting", file=sys.stderr)
             return self._set_wallpaper_kde_native(wallpaper_path, monitor)
+        finally:
+            # Any other error (e.g. awww missing) must not leave matugen running unreaped
+            self._reap_matugen(matugen_job)
     
     def _set_wallpaper_kde_native(self, wallpaper_path: Path, monitor: Optional[str] = None) -> bool:
         """Set wallpaper using native KDE methods (no transitions) with matugen support"""
+        # Generate colors with matugen for KDE native method too, alongside the D-Bus call
+        matugen_job = self._start_matugen(wallpaper_path)
         try:
-            # Generate colors with matugen for KDE native method too
-            matugen_success = self._generate_matugen_colors(wallpaper_path)
             
             if monitor:
                 # Set wallpaper for specific monitor using KDE's desktop scripting
@@ -236,13 +421,15 @@ class KDEBackend:
                 if monitor_info:
                     kde_desktop_id = monitor_info.get('kde_desktop_id', '0')
                     
-                    # Use KDE's desktop scripting to set wallpaper for specific desktop/screen
+                    # Use KDE's desktop scripting to set wallpaper for specific desktop/screen;
+                    # a percent-encoded URL keeps '#', '?' and quotes in file names intact
+                    wallpaper_url = Path(wallpaper_path).absolute().as_uri()
                     script = f'''
                     var desktop = desktops()[{kde_desktop_id}];
                     if (desktop) {{
                         desktop.wallpaperPlugin = "org.kde.image";
                         desktop.currentConfigGroup = ["Wallpaper", "org.kde.image", "General"];
-                        desktop.writeConfig("Image", "file://{wallpaper_path}");
+                        desktop.writeConfig("Image", "{wallpaper_url}");
                         desktop.writeConfig("FillMode", "2"); // Scaled, keep proportions
                         desktop.reloadConfig();
                     }}
@@ -251,73 +438,78 @@ class KDEBackend:
                     subprocess.run([
                         'qdbus', 'org.kde.plasmashell', '/PlasmaShell', 
                         'org.kde.PlasmaShell.evaluateScript', script
-                    ], check=True, capture_output=True)
+                    ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
                     
                     print(f"Wall-IT: Set wallpaper on monitor {monitor} (KDE desktop {kde_desktop_id})")
                 else:
                     print(f"Warning: Monitor {monitor} not found, falling back to all monitors", file=sys.stderr)
+                    self._finish_matugen(matugen_job)
                     return self._set_wallpaper_kde_native(wallpaper_path, None)
             else:
                 # Set wallpaper on all monitors using plasma-apply-wallpaperimage
                 subprocess.run([
                     'plasma-apply-wallpaperimage', str(wallpaper_path)
-                ], check=True, capture_output=True)
+                ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
                 
                 print(f"Wall-IT: Set wallpaper on all monitors (KDE native)")
             
             # Apply KDE-specific color integration if matugen succeeded
-            if matugen_success:
+            if self._finish_matugen(matugen_job):
                 self._apply_kde_colors()
                 print(f"Wall-IT: Generated dynamic colors with matugen")
             
             return True
             
         except subprocess.CalledProcessError as e:
+            self._finish_matugen(matugen_job)
             error_msg = e.stderr.decode() if e.stderr else str(e)
             print(f"Error setting wallpaper with KDE: {error_msg}", file=sys.stderr)
             return False
+        finally:
+            self._reap_matugen(matugen_job)
     
     def get_current_wallpaper(self, monitor: Optional[str] = None) -> Optional[Path]:
         """Get current wallpaper for specific monitor or primary monitor"""
         try:
             if monitor:
                 monitor_info = self.get_monitor_by_connector(monitor)
-                if monitor_info:
-                    kde_desktop_id = monitor_info.get('kde_desktop_id', '0')
-                    
-                    # Query current wallpaper using KDE's desktop scripting
-                    script = f'''
-                    var desktop = desktops()[{kde_desktop_id}];
-                    if (desktop) {{
-                        desktop.currentConfigGroup = ["Wallpaper", "org.kde.image", "General"];
-                        var image = desktop.readConfig("Image");
-                        print(image);
-                    }}
-                    '''
-                    
-                    result = subprocess.run([
-                        'qdbus', 'org.kde.plasmashell', '/PlasmaShell', 
-                        'org.kde.PlasmaShell.evaluateScript', script
-                    ], capture_output=True, text=True, check=True)
-                    
-                    wallpaper_url = result.stdout.strip()
-                    if wallpaper_url.startswith('file://'):
-                        wallpaper_path = Path(wallpaper_url[7:])  # Remove 'file://' prefix
-                        if wallpaper_path.exists():
-                            return wallpaper_path
             else:
                 # Fallback to reading from first monitor
                 monitors = self.get_monitors()
-                if monitors:
-                    return self.get_current_wallpaper(monitors[0]['connector'])
+                monitor_info = monitors[0] if monitors else None
+            
+            if monitor_info:
+                return self._wallpaper_for_desktop(monitor_info.get('kde_desktop_id', '0'))
                     
-        except subprocess.CalledProcessError as e:
-            print(f"Error getting current wallpaper: {e}", file=sys.stderr)
         except Exception as e:
             print(f"Error getting current wallpaper: {e}", file=sys.stderr)
         
         return None
     
+    def get_all_current_wallpapers(self) -> Dict[str, Optional[Path]]:
+        """Get the current wallpaper of every monitor ({connector: path}) from one Plasma query"""
+        try:
+            return {
+                monitor['connector']: self._wallpaper_for_desktop(monitor.get('kde_desktop_id', '0'))
+                for monitor in self.get_monitors()
+            }
+        except Exception as e:
+            print(f"Error getting current wallpapers: {e}", file=sys.stderr)
+            return {}
+    
+    def _wallpaper_for_desktop(self, kde_desktop_id: str) -> Optional[Path]:
+        """Resolve a desktop's wallpaper from the batched Plasma state"""
+        wallpaper_url = self._query_plasma()['wallpapers'].get(kde_desktop_id, '')
+        if wallpaper_url.startswith('file://'):
+            # Plasma percent-encodes the path (e.g. spaces as %20), but URLs written
+            # raw by older Wall-IT versions may contain a literal '#', '?' or '%'
+            raw_path = wallpaper_url[len('file://'):]
+            for candidate in (unquote(raw_path), raw_path):
+                wallpaper_path = Path(candidate)
+                if wallpaper_path.exists():
+                    return wallpaper_path
+        return None
+    
     def supports_per_monitor_wallpapers(self) -> bool:
         """Check if the backend supports per-monitor wallpapers"""
         return True  # KDE supports per-monitor wallpapers
@@ -344,27 +536,21 @@ class KDEBackend:
     
     def check_plasma_version(self) -> str:
         """Check Plasma version for compatibility"""
+        version = self._query_plasma()['plasma_version']
+        if version:
+            return version
+        
+        # Fallback method when plasmashell is not reachable over D-Bus
         try:
-            result = subprocess.run([
-                'qdbus', 'org.kde.plasmashell', '/PlasmaShell',
-                'org.freedesktop.DBus.Properties.Get',
-                'org.kde.PlasmaShell', 'plasmaVersion'
-            ], capture_output=True, text=True, timeout=5)
-            
+            result = subprocess.run(['plasmashell', '--version'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=3)
             if result.returncode == 0:
-                version = result.stdout.strip()
-                return version
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-            # Fallback method
-            try:
-                result = subprocess.run(['plasmashell', '--version'], capture_output=True, text=True, timeout=3)
                 for line in result.stdout.split('\n'):
                     if 'plasmashell' in line.lower():
                         parts = line.split()
                         if len(parts) > 1:
                             return parts[-1]
-            except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-                pass
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            pass
         
         return "Unknown"
     
@@ -372,96 +558,158 @@ class KDEBackend:
         """Get current KDE theme information"""
         theme_info = {}
         
-        try:
-            # Get Plasma theme
-            result = subprocess.run([
-                'kreadconfig5', '--group', 'Theme', '--key', 'name'
-            ], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                theme_info['plasma_theme'] = result.stdout.strip()
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        # Read kdeglobals directly: system defaults first (XDG_CONFIG_DIRS lists the
+        # most important directory first), user settings last so they override
+        config_home = Path(os.environ.get('XDG_CONFIG_HOME', Path.home() / ".config"))
+        config_dirs = [d for d in os.environ.get('XDG_CONFIG_DIRS', '/etc/xdg').split(':') if d]
+        config_files = [Path(d) / "kdeglobals" for d in reversed(config_dirs)]
+        config_files.append(config_home / "kdeglobals")
         
-        try:
-            # Get color scheme
-            result = subprocess.run([
-                'kreadconfig5', '--group', 'General', '--key', 'ColorScheme'
-            ], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                theme_info['color_scheme'] = result.stdout.strip()
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        # Unchanged files: reuse the previous result
+        stamp = []
+        for config_file in config_files:
+            try:
+                st = config_file.stat()
+                stamp.append((str(config_file), st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append((str(config_file), None, None))
+        stamp = tuple(stamp)
+        if self._theme_cache is not None and self._theme_cache[0] == stamp:
+            return dict(self._theme_cache[1])
+        
+        parser = configparser.ConfigParser(interpolation=None, strict=False)
+        parser.optionxform = str
+        for config_file in config_files:
+            # One file per attempt so a broken system file can't hide the user's settings
+            try:
+                parser.read(config_file, encoding='utf-8')
+            except configparser.Error:
+                pass  # Keep whatever parsed; KDE files may contain lines configparser rejects
+            except UnicodeDecodeError as e:
+                print(f"Warning: Could not read {config_file}: {e}", file=sys.stderr)
+        
+        # Get Plasma theme
+        plasma_theme = parser.get('Theme', 'name', fallback=None)
+        if plasma_theme is not None:
+            theme_info['plasma_theme'] = plasma_theme
+        
+        # Get color scheme
+        color_scheme = parser.get('General', 'ColorScheme', fallback=None)
+        if color_scheme is not None:
+            theme_info['color_scheme'] = color_scheme
         
+        self._theme_cache = (stamp, dict(theme_info))
         return theme_info
     
     def _check_matugen_available(self) -> bool:
         """Check if matugen is available for color generation"""
+        return self._which('matugen') is not None
+    
+    def _read_setting(self, name: str) -> Optional[str]:
+        """Read a stripped Wall-IT setting file from the cache dir, re-reading only when it changes"""
+        setting_file = self._cache_dir / name
         try:
-            subprocess.run(['matugen', '--version'], capture_output=True, check=True, timeout=5)
-            return True
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+            st = setting_file.stat()
+        except OSError:
+            self._settings_cache.pop(name, None)
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._settings_cache.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            value = setting_file.read_text().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+        self._settings_cache[name] = (stamp, value)
+        return value
     
     def _get_matugen_scheme(self) -> str:
         """Get matugen color scheme from cache or use default"""
-        try:
-            cache_dir = Path.home() / ".cache" / "wall-it"
-            scheme_file = cache_dir / "matugen_scheme"
-            if scheme_file.exists():
-                scheme = scheme_file.read_text().strip()
-                # Fix old scheme names to new format
-                if scheme in ['content', 'expressive', 'fidelity', 'fruit-salad', 'monochrome', 'neutral', 'rainbow', 'tonal-spot']:
-                    scheme = f'scheme-{scheme}'
-                return scheme
-        except Exception:
-            pass
-        return 'scheme-expressive'  # Default scheme
+        scheme = self._read_setting("matugen_scheme")
+        if scheme is None:
+            return 'scheme-expressive'  # Default scheme
+        # Fix old scheme names to new format
+        if scheme in ['content', 'expressive', 'fidelity', 'fruit-salad', 'monochrome', 'neutral', 'rainbow', 'tonal-spot']:
+            scheme = f'scheme-{scheme}'
+        return scheme
     
     def _is_matugen_enabled(self) -> bool:
         """Check if matugen is enabled in Wall-IT config"""
-        try:
-            cache_dir = Path.home() / ".cache" / "wall-it"
-            matugen_file = cache_dir / "matugen_enabled"
-            if matugen_file.exists():
-                return matugen_file.read_text().strip().lower() == 'true'
-        except Exception:
-            pass
-        return True  # Default to enabled if matugen is available
+        enabled = self._read_setting("matugen_enabled")
+        if enabled is None:
+            return True  # Default to enabled if matugen is available
+        return enabled.lower() == 'true'
     
     def _get_matugen_mode(self) -> str:
         """Return 'light' or 'dark' based on the saved Wall-IT theme setting."""
-        try:
-            theme_file = Path.home() / ".cache" / "wall-it" / "theme"
-            if theme_file.exists():
-                theme = theme_file.read_text().strip()
-                if theme == 'light':
-                    return 'light'
-        except Exception:
-            pass
-        return 'dark'
+        return 'light' if self._read_setting("theme") == 'light' else 'dark'
 
     def _generate_matugen_colors(self, wallpaper_path: Path) -> bool:
         """Generate colors using matugen for KDE integration"""
+        return self._finish_matugen(self._start_matugen(wallpaper_path))
+    
+    def _start_matugen(self, wallpaper_path: Path) -> Optional[tuple]:
+        """Launch matugen in the background so it can overlap with setting the wallpaper.
+        
+        Returns (process, key) for _finish_matugen, (None, key) when the cached
+        colors already match, or None when matugen is unavailable or disabled.
+        """
         if not self._check_matugen_available() or not self._is_matugen_enabled():
-            return False
+            return None
         
         try:
             scheme = self._get_matugen_scheme()
             mode = self._get_matugen_mode()
+            
+            # Same image (by size/mtime) with the same settings: the colors are already there
+            st = wallpaper_path.stat()
+            key = f"{wallpaper_path}:{st.st_size}:{st.st_mtime_ns}:{scheme}:{mode}"
+            try:
+                # The key is read first: on a miss that is the only syscall we pay
+                if (self._cache_dir / "matugen_key").read_text() == key and \
+                        (self._cache_dir / "matugen_colors.json").exists():
+                    return None, key
+            except FileNotFoundError:
+                pass
+            
             cmd = [
                 'matugen', 'image', str(wallpaper_path),
                 '--mode', mode,
                 '--type', scheme,
                 '--json', 'hex'
             ]
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            return proc, key
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, check=True)
+        except Exception as e:
+            print(f"Warning: matugen error: {e}", file=sys.stderr)
+            return None
+    
+    def _finish_matugen(self, job: Optional[tuple]) -> bool:
+        """Wait for a matugen run from _start_matugen and store its colors"""
+        if job is None:
+            return False
+        proc, key = job
+        if proc is None:
+            return True
+        
+        try:
+            try:
+                stdout, _ = proc.communicate(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
             
             # Store the generated colors for KDE integration
-            cache_dir = Path.home() / ".cache" / "wall-it"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            colors_file = cache_dir / "matugen_colors.json"
-            colors_file.write_text(result.stdout)
+            (self._cache_dir / "matugen_colors.json").write_text(stdout)
+            key_file = self._cache_dir / "matugen_key"
+            tmp_key = key_file.with_suffix('.tmp')
+            tmp_key.write_text(key)
+            os.replace(tmp_key, key_file)
             
             return True
             
@@ -472,17 +720,37 @@ class KDEBackend:
             print(f"Warning: matugen error: {e}", file=sys.stderr)
             return False
     
+    @staticmethod
+    def _reap_matugen(job: Optional[tuple]):
+        """Stop and wait for a matugen run that _finish_matugen never collected"""
+        if job is None or job[0] is None:
+            return
+        proc = job[0]
+        if proc.returncode is not None:
+            return  # Already collected
+        proc.terminate()
+        try:
+            proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+    
     def _apply_kde_colors(self):
         """Apply matugen colors to KDE/Plasma themes and applications"""
         try:
-            cache_dir = Path.home() / ".cache" / "wall-it"
-            colors_file = cache_dir / "matugen_colors.json"
+            colors_file = self._cache_dir / "matugen_colors.json"
             
-            if not colors_file.exists():
+            try:
+                mtime = colors_file.stat().st_mtime_ns
+            except FileNotFoundError:
                 return
             
-            import json
-            colors_data = json.loads(colors_file.read_text())
+            # Re-parse only when matugen wrote a new file
+            if self._colors_cache is not None and self._colors_cache[0] == mtime:
+                colors_data = self._colors_cache[1]
+            else:
+                colors_data = json.loads(colors_file.read_text())
+                self._colors_cache = (mtime, colors_data)
             
             if 'colors' not in colors_data:
                 return
@@ -504,7 +772,7 @@ class KDEBackend:
         """Update GTK applications with matugen colors"""
         try:
             # This is a simplified approach - full GTK theming would require more complex CSS generation
-            gtk_config = Path.home() / ".config" / "gtk-3.0" / "gtk.css"
+            gtk_config = self._gtk_css
             gtk_config.parent.mkdir(parents=True, exist_ok=True)
             
             # Basic color variables that some GTK apps might use
@@ -517,27 +785,17 @@ class KDEBackend:
 }}
 """
             
-            # Append to existing GTK CSS (don't overwrite)
-            if gtk_config.exists():
-                existing = gtk_config.read_text()
-                if "/* Wall-IT Generated Colors */" not in existing:
-                    css_content = existing + "\n\n" + css_content
-                else:
-                    # Replace existing Wall-IT section
-                    lines = existing.split('\n')
-                    new_lines = []
-                    skip = False
-                    for line in lines:
-                        if "/* Wall-IT Generated Colors */" in line:
-                            skip = True
-                        elif skip and line.startswith('}'):
-                            skip = False
-                            continue
-                        if not skip:
-                            new_lines.append(line)
-                    css_content = '\n'.join(new_lines) + "\n\n" + css_content
+            # Append to existing GTK CSS (don't overwrite), replacing any previous Wall-IT section.
+            # Work on bytes so the user's file is never decoded/re-encoded.
+            try:
+                existing = _WALLIT_BLOCK_RE.sub(b'', gtk_config.read_bytes()).rstrip(b'\n')
+            except FileNotFoundError:
+                existing = b''
+            data = css_content.encode()
+            if existing:
+                data = existing + b"\n\n" + data
             
-            gtk_config.write_text(css_content)
+            gtk_config.write_bytes(data)
             
         except Exception as e:
             print(f"Warning: Could not update GTK colors: {e}", file=sys.stderr)
@@ -546,7 +804,7 @@ class KDEBackend:
         """Update terminal applications with matugen colors (basic support)"""
         try:
             # Export colors as environment variables for terminal apps that support them
-            color_env = Path.home() / ".cache" / "wall-it" / "terminal_colors.sh"
+            color_env = self._cache_dir / "terminal_colors.sh"
             
             env_content = f"""#!/bin/bash
 # Wall-IT Generated Terminal Colors
@@ -573,22 +831,24 @@ def test_kde_backend():
     print("=" * 50)
     
     # Basic availability
+    backend.verify_tools()
     print(f"KDE Backend Available: {backend.is_available()}")
     print(f"Plasma Version: {backend.check_plasma_version()}")
 
     # Feature support
     print(f"Supports Per-Monitor: {backend.supports_per_monitor_wallpapers()}")
     print(f"Supports Transitions: {backend.supports_transitions()}")
+    matugen_available = backend._check_matugen_available()
+    matugen_enabled = backend._is_matugen_enabled()
     print(f"awww Daemon Available: {backend.awww_available}")
-    print(f"matugen Available: {backend._check_matugen_available()}")
-    print(f"matugen Enabled: {backend._is_matugen_enabled()}")
+    print(f"matugen Available: {matugen_available}")
+    print(f"matugen Enabled: {matugen_enabled}")
 
     # Operating mode
+    matugen_text = " + matugen colors" if matugen_available else ""
     if backend.awww_available:
-        matugen_text = " + matugen colors" if backend._check_matugen_available() else ""
         print(f"\n🎨 Operating Mode: Hybrid (KDE monitor detection + awww transitions{matugen_text})")
     else:
-        matugen_text = " + matugen colors" if backend._check_matugen_available() else ""
         print(f"\n🖥️ Operating Mode: Native KDE wallpaper system{matugen_text}")
     
     # Theme information
@@ -610,8 +870,9 @@ def test_kde_backend():
     
     # Current wallpapers
     print(f"\n🖼️ Current Wallpapers:")
+    wallpapers = backend.get_all_current_wallpapers()
     for monitor in monitors:
-        current = backend.get_current_wallpaper(monitor['connector'])
+        current = wallpapers.get(monitor['connector'])
         current_name = current.name if current else "None"
         print(f"  {monitor['connector']}: {current_name}")
     
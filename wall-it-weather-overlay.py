@@ -764,6 +764,20 @@ FRAGMENTS = {
 }
 # Effects that read the wallpaper as a texture and render opaque.
 NEEDS_WALLPAPER = {"rain", "storm", "sun"}
+# Uniforms the render loop sets on every effect program.
+UNIFORM_NAMES = ("u_time", "u_resolution", "u_alternative", "u_sunColor",
+                 "u_strength", "u_wallpaper")
+# Slow-moving effects look identical at 30 FPS; skip the in-between vsync frames
+# for them instead of re-rendering at the monitor's full refresh rate.
+SLOW_EFFECTS = {"cloud", "sun", "stars"}
+SLOW_FRAME_INTERVAL_US = 1_000_000 // 30
+
+
+def frame_interval_us(effects):
+    """Minimum time between rendered frames for a set of effect layers."""
+    if all(effect in SLOW_EFFECTS for effect, _params in effects):
+        return SLOW_FRAME_INTERVAL_US
+    return 0
 
 
 def load_wallpaper_rgba():
@@ -782,11 +796,18 @@ def load_wallpaper_rgba():
     if path is None or not path.exists():
         return None
     try:
-        img = Image.open(path).convert("RGBA")
+        img = Image.open(path)
         w, h = img.size
         scale = min(1.0, MAX_TEXTURE_SIDE / float(max(w, h)))
+        target = (max(1, int(w * scale)), max(1, int(h * scale)))
         if scale < 1.0:
-            img = img.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.LANCZOS)
+            # JPEGs: let libjpeg decode at a reduced DCT scale that still covers
+            # the target size (no-op for other formats)
+            img.draft("RGB", target)
+        img = img.convert("RGBA")
+        if img.size != target:
+            # reducing_gap box-reduces first, then LANCZOS only on the remainder
+            img = img.resize(target, Image.LANCZOS, reducing_gap=2.0)
         return img.width, img.height, img.tobytes()
     except Exception as exc:
         print(f"\u26a0\ufe0f  Could not load wallpaper texture: {exc}")
@@ -812,8 +833,10 @@ class GLView:
         self.ctx = None
         self.programs = {}
         self.vaos = {}
+        self.uniforms = {}  # effect -> {uniform name: moderngl Uniform}
         self.texture = None
         self.tex_gen = -1
+        self.last_frame_us = 0
 
         self.area = Gtk.GLArea()
         self.area.set_has_depth_buffer(False)
@@ -843,6 +866,10 @@ class GLView:
                 prog = self.ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=frag)
                 self.programs[name] = prog
                 self.vaos[name] = self.ctx.vertex_array(prog, [])
+                # Resolve uniform handles once; unused uniforms are optimised
+                # out by the GLSL compiler and simply absent here
+                handles = {u: prog.get(u, None) for u in UNIFORM_NAMES}
+                self.uniforms[name] = {u: h for u, h in handles.items() if h is not None}
             except Exception as exc:
                 print(f"\u274c Shader compile failed for '{name}': {exc}")
                 self.app.fail()
@@ -867,25 +894,33 @@ class GLView:
                 pass
         self.vaos.clear()
         self.programs.clear()
+        self.uniforms.clear()
         self.texture = None
         self.ctx = None
 
     def _upload_texture(self):
         if self.ctx is None:
             return
+        wp = self.app.wallpaper
+        if wp is None:
+            # 1x1 neutral grey fallback so samplers still work.
+            size, data = (1, 1), bytes((90, 90, 95, 255))
+        else:
+            w, h, data = wp
+            size = (w, h)
+        if self.texture is not None and self.texture.size == size:
+            # Same dimensions (the usual case on a wallpaper change): refill the
+            # existing texture in place instead of reallocating it.
+            self.texture.write(data)
+            self.tex_gen = self.app.wallpaper_gen
+            return
         if self.texture is not None:
             try:
                 self.texture.release()
             except Exception:
                 pass
             self.texture = None
-        wp = self.app.wallpaper
-        if wp is None:
-            # 1x1 neutral grey fallback so samplers still work.
-            self.texture = self.ctx.texture((1, 1), 4, bytes((90, 90, 95, 255)))
-        else:
-            w, h, data = wp
-            self.texture = self.ctx.texture((w, h), 4, data)
+        self.texture = self.ctx.texture(size, 4, data)
         self.texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
         self.texture.repeat_x = False
         self.texture.repeat_y = False
@@ -912,29 +947,31 @@ class GLView:
         # Premultiplied-alpha "over" blending (shaders output premultiplied rgb).
         self.ctx.blend_func = (moderngl.ONE, moderngl.ONE_MINUS_SRC_ALPHA)
 
-        t = self.app.elapsed()
+        # Frame-clock timestamp of the frame being drawn, so motion follows vblank
+        t = self.app.elapsed(self.last_frame_us or None)
         for effect, params in self.app.effects:
-            prog = self.programs.get(effect)
             vao = self.vaos.get(effect)
-            if prog is None or vao is None:
+            uniforms = self.uniforms.get(effect)
+            if vao is None or uniforms is None:
                 continue
-            self._set(prog, "u_time", t)
-            self._set(prog, "u_resolution", (float(w), float(h)))
-            self._set(prog, "u_alternative", float(params.get("alternative", 0.0)))
-            self._set(prog, "u_sunColor", tuple(params.get("sun_color", (1.0, 0.95, 0.7))))
-            self._set(prog, "u_strength", float(params.get("strength", 1.0)))
+            self._set(uniforms, "u_time", t)
+            self._set(uniforms, "u_resolution", (float(w), float(h)))
+            self._set(uniforms, "u_alternative", float(params.get("alternative", 0.0)))
+            self._set(uniforms, "u_sunColor", tuple(params.get("sun_color", (1.0, 0.95, 0.7))))
+            self._set(uniforms, "u_strength", float(params.get("strength", 1.0)))
             if effect in NEEDS_WALLPAPER and self.texture is not None:
                 self.texture.use(0)
-                self._set(prog, "u_wallpaper", 0)
+                self._set(uniforms, "u_wallpaper", 0)
             vao.render(mode=moderngl.TRIANGLES, vertices=3)
         return True
 
     @staticmethod
-    def _set(prog, name, value):
+    def _set(uniforms, name, value):
+        uniform = uniforms.get(name)
+        if uniform is None:
+            return
         try:
-            prog[name].value = value
-        except KeyError:
-            pass
+            uniform.value = value
         except Exception:
             pass
 
@@ -945,19 +982,24 @@ class WeatherOverlay:
     def __init__(self, force=None):
         self.force = force
         self.effects = resolve_effects(force)
+        self.frame_interval = frame_interval_us(self.effects)
         self.wallpaper = load_wallpaper_rgba()
         self.wallpaper_gen = 0
         self._wp_sig = wallpaper_signature()
         self.windows = []
         self.views = []
-        self._start = time.monotonic()
+        # Same clock as Gdk.FrameClock.get_frame_time() (microseconds)
+        self._start_us = GLib.get_monotonic_time()
+        self._tick_ids = []
         self._stopping = False
         self.app = Gtk.Application(application_id="dev.wallit.WeatherOverlay")
         self.app.connect("activate", self.on_activate)
 
     # ── time base shared by all monitors ─────────────────────────────────────
-    def elapsed(self):
-        return time.monotonic() - self._start
+    def elapsed(self, frame_time_us=None):
+        if frame_time_us is None:
+            frame_time_us = GLib.get_monotonic_time()
+        return (frame_time_us - self._start_us) / 1_000_000
 
     # ── startup ──────────────────────────────────────────────────────────────
     def on_activate(self, app):
@@ -968,9 +1010,14 @@ class WeatherOverlay:
             app.quit()
             return
 
-        # Make GTK window backgrounds transparent so the wallpaper shows through.
+        # Make GTK window backgrounds transparent so the wallpaper shows through,
+        # and drop the theme's shadows/rounding/transitions: the overlay is one
+        # fullscreen GLArea, so any of them is pure extra compositing work.
         css = Gtk.CssProvider()
-        css.load_from_data(b"window, .background { background: transparent; }")
+        css.load_from_data(
+            b"window, .background { background: transparent; }"
+            b" * { border-radius: 0; box-shadow: none; transition: none; }"
+        )
         Gtk.StyleContext.add_provider_for_display(
             display, css, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
@@ -1020,7 +1067,8 @@ class WeatherOverlay:
             win.present()
 
             # Continuous, vsync-aligned redraw.
-            win.add_tick_callback(lambda widget, clock: self._tick(view))
+            tick_id = win.add_tick_callback(lambda widget, clock: self._tick(view, clock))
+            self._tick_ids.append((win, tick_id))
 
             self.windows.append(win)
             self.views.append(view)
@@ -1041,7 +1089,11 @@ class WeatherOverlay:
             except Exception:
                 pass
 
-    def _tick(self, view):
+    def _tick(self, view, clock):
+        now = clock.get_frame_time()
+        if now - view.last_frame_us < self.frame_interval:
+            return GLib.SOURCE_CONTINUE
+        view.last_frame_us = now
         view.area.queue_render()
         return GLib.SOURCE_CONTINUE
 
@@ -1071,6 +1123,7 @@ class WeatherOverlay:
         if effects != self.effects:
             print(f"\U0001f3ac Weather changed: {self.effects} -> {effects}")
             self.effects = effects
+            self.frame_interval = frame_interval_us(effects)
         return GLib.SOURCE_CONTINUE
 
     def _on_signal(self):
@@ -1088,6 +1141,12 @@ class WeatherOverlay:
         if self._stopping:
             return
         self._stopping = True
+        for win, tick_id in self._tick_ids:
+            try:
+                win.remove_tick_callback(tick_id)
+            except Exception:
+                pass
+        self._tick_ids.clear()
         for win in self.windows:
             try:
                 win.destroy()
@@ -5,6 +5,7 @@ Professional wallpaper manager with system tray, monitor scaling, timer, drag&dr
 """
 
 import os
+import re
 import sys
 import threading
 import subprocess
@@ -12,9 +13,12 @@ import hashlib
 import random
 import shutil
 import json
+import atexit
 import tempfile
 import time
 import signal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 import importlib.util
@@ -161,23 +165,143 @@ print("ℹ️ System tray available via separate process")
 
 # Import image processing libraries for effects
 try:
-    from PIL import Image, ImageFilter, ImageEnhance
+    from PIL import Image, ImageFilter, ImageEnhance, ImageStat
+    import PIL
     PIL_AVAILABLE = True
     print("✅ PIL/Pillow available - Photo effects enabled")
+    try:
+        from PIL import features as _pil_features
+        _turbo = _pil_features.check_feature('libjpeg_turbo')
+    except Exception:
+        _turbo = None
+    # Pillow-SIMD reports a version like "9.5.0.post1"
+    print(f"ℹ️ Pillow {PIL.__version__}"
+          f"{' (SIMD build)' if '.post' in PIL.__version__ else ''}"
+          f", libjpeg-turbo: {'yes' if _turbo else 'no' if _turbo is not None else 'unknown'}")
 except ImportError:
     PIL_AVAILABLE = False
     print("⚠️ PIL/Pillow not available - Install with: paru -S python-pillow")
 
+# Faster non-cryptographic hash for thumbnail cache keys (hashlib fallback)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+def _pil_thumbnail_pixbuf(image_path, size):
+    """Decode an image to a thumbnail-sized pixbuf via Pillow.
+
+    draft() lets libjpeg decode at a reduced DCT scale, so the LANCZOS step only
+    sees a few times the target size instead of the full-resolution image.
+    """
+    with Image.open(image_path) as img:
+        img.draft('RGB', (size[0] * 2, size[1] * 2))
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+        channels = 4 if has_alpha else 3
+        return GdkPixbuf.Pixbuf.new_from_bytes(
+            GLib.Bytes.new(img.tobytes()), GdkPixbuf.Colorspace.RGB, has_alpha, 8,
+            img.width, img.height, img.width * channels)
+
+
+def _load_pixbuf_scaled(image_path, size):
+    """Decode with a PixbufLoader that is told the target size before decoding.
+
+    Setting the size from 'size-prepared' lets loaders such as libjpeg pick a
+    reduced DCT scale instead of decoding at full resolution first.
+    """
+    def on_size_prepared(loader, width, height):
+        scale = min(size[0] / width, size[1] / height, 1.0)
+        loader.set_size(max(1, int(width * scale)), max(1, int(height * scale)))
+    
+    loader = GdkPixbuf.PixbufLoader()
+    loader.connect('size-prepared', on_size_prepared)
+    try:
+        with open(image_path, 'rb') as f:
+            while chunk := f.read(65536):
+                loader.write(chunk)
+    finally:
+        loader.close()
+    pixbuf = loader.get_pixbuf()
+    if pixbuf is None:
+        raise ValueError(f"could not decode {image_path}")
+    return pixbuf
+
+
+# Thumbnail decode pool shared by every folder browser window, created on first use
+_THUMB_EXECUTOR = None
+_THUMB_EXECUTOR_LOCK = threading.Lock()
+
+
+def _thumb_executor():
+    """Return the shared thumbnail decode pool"""
+    global _THUMB_EXECUTOR
+    with _THUMB_EXECUTOR_LOCK:
+        if _THUMB_EXECUTOR is None:
+            _THUMB_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                                 thread_name_prefix='thumb')
+        return _THUMB_EXECUTOR
+
+
+# Lines of interest in `niri msg outputs`, scanned in a single pass
+_NIRI_OUTPUTS_RE = re.compile(
+    r'^\s*Output "(?P<name>[^"]*)" \((?P<id>[^)]+)\)'
+    r'|Current mode:\s*(?P<w>\d+)x(?P<h>\d+)\s*@\s*(?P<r>[\d.]+)'
+    r'|Scale:\s*(?P<s>[\d.]+)'
+    r'|Logical position:\s*(?P<x>-?\d+),\s*(?P<y>-?\d+)',
+    re.MULTILINE)
+
+# Results of subprocess-backed detectors: key -> (value, expires_at monotonic)
+_DETECTOR_CACHE = {}
+_DETECTOR_CACHE_LOCK = threading.Lock()
+
+
+def _cached(key, ttl, fn):
+    """Return fn() memoized under key for ttl seconds"""
+    now = time.monotonic()
+    with _DETECTOR_CACHE_LOCK:
+        hit = _DETECTOR_CACHE.get(key)
+        if hit is not None and hit[1] > now:
+            return hit[0]
+    value = fn()
+    with _DETECTOR_CACHE_LOCK:
+        _DETECTOR_CACHE[key] = (value, now + ttl)
+    return value
+
+
 class EnhancedFolderBrowser(Gtk.Window):
     """Enhanced folder browser with thumbnail grid and individual file selection"""
     
+    # In-memory thumbnails kept across folder switches (~90 KB each at 150x150 RGBA)
+    THUMBNAIL_CACHE_LIMIT = 512
+    # Upper bound on source image data hinted into the page cache per viewport batch
+    PREFETCH_BYTES = 64 * 1024 * 1024
+    
     def __init__(self, parent, config):
         super().__init__()
         self.parent = parent
         self.config = config
         self.selected_files = set()
         self.current_folder = Path.home()
-        self.thumbnail_cache = {}  # Cache thumbnails to avoid regenerating
+        self.thumbnail_cache = OrderedDict()  # LRU of (path, mtime_ns) -> Gdk.Texture
+        # Thumbnails are decoded off the main thread; bumping the generation
+        # on navigation makes late results for the old folder get dropped
+        self._thumb_futures = []
+        self._pending_decodes = []  # (widget, path, cache_key) not yet near the viewport
+        self._decode_check_scheduled = False
+        self._layout_retry_scheduled = False
+        self._load_generation = 0
+        # Finished decodes are installed in batches rather than one idle call each
+        self._pending_installs = []
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        # Decoded thumbnails persist across sessions, keyed by path + mtime + size
+        self._thumb_cache_dir = config.cache_dir / "thumbnails" / "browser"
+        self._thumb_cache_dir.mkdir(parents=True, exist_ok=True)
+        self.connect('destroy', self._on_destroy)
         
         self.set_title("🖼️ Select Wallpapers from Folder")
         self.set_default_size(1000, 700)
@@ -272,55 +396,69 @@ class EnhancedFolderBrowser(Gtk.Window):
         
         scrolled.set_child(self.flow_box)
         parent_box.append(scrolled)
+        
+        # Thumbnails are only decoded once they scroll near the viewport;
+        # 'changed' fires after layout and on resize, 'value-changed' on scroll
+        self._vadjustment = scrolled.get_vadjustment()
+        self._vadjustment.connect('changed', self._schedule_visible_decodes)
+        self._vadjustment.connect('value-changed', self._schedule_visible_decodes)
+        # A folder that fits on one page never changes the adjustment after the
+        # first layout, so also check when the grid is shown
+        self.flow_box.connect('map', self._schedule_visible_decodes)
     
     def load_current_folder(self):
         """Load contents of current folder"""
         self.path_label.set_text(f"📁 {self.current_folder}")
         
-        # Clear existing items
-        child = self.flow_box.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.flow_box.remove(child)
-            child = next_child
+        # Clear existing items (remove_all needs GTK 4.12)
+        if hasattr(self.flow_box, 'remove_all'):
+            self.flow_box.remove_all()
+        else:
+            child = self.flow_box.get_first_child()
+            while child:
+                next_child = child.get_next_sibling()
+                self.flow_box.remove(child)
+                child = next_child
         
         self.selected_files.clear()
-        self.thumbnail_cache.clear()  # Clear cache to regenerate thumbnails with new size
         self.update_selection_label()
         
+        # Stop decoding thumbnails for the folder we are leaving
+        self._load_generation += 1
+        for future in self._thumb_futures:
+            future.cancel()
+        self._thumb_futures = []
+        self._pending_decodes = []
+        
         try:
             # Get folders and image files
             folders = []
             images = []
+            is_image_name = self.config.is_image_name
             
-            for item in self.current_folder.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    folders.append(item)
-                elif item.is_file() and item.suffix.lower() in self.config.image_extensions:
-                    images.append(item)
+            # scandir reuses the file type from the directory listing, so only
+            # symlinks need an extra stat
+            with os.scandir(self.current_folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir():
+                        if not name.startswith('.'):
+                            folders.append((name.lower(), entry.path))
+                    elif is_image_name(name) and entry.is_file():
+                        images.append((name.lower(), entry.path))
             
-            # Sort items
-            folders.sort(key=lambda x: x.name.lower())
-            images.sort(key=lambda x: x.name.lower())
+            # Sort items by their precomputed lowercase names
+            folders = [Path(path) for _, path in sorted(folders)]
+            images = [Path(path) for _, path in sorted(images)]
             
             # Add folders first
             for folder in folders:
                 self.add_folder_item(folder)
             
-            # Add image thumbnails with progress feedback
-            total_images = len(images)
-            if total_images > 0:
-                # Show progress for many images
-                for i, image in enumerate(images):
-                    self.add_image_item(image)
-                    
-                    # Update progress every 10 images or at the end
-                    if (i + 1) % 10 == 0 or i == total_images - 1:
-                        # Force GUI update to show thumbnails as they load
-                        # In GTK4, we use GLib.MainContext instead of Gtk.main_iteration_do
-                        context = GLib.MainContext.default()
-                        while context.pending():
-                            context.iteration(False)
+            # Add image items right away; thumbnails fill in as worker threads decode them
+            for image in images:
+                self.add_image_item(image)
+            self._schedule_visible_decodes()
         
         except PermissionError:
             # Add permission denied message
@@ -392,81 +530,271 @@ class EnhancedFolderBrowser(Gtk.Window):
         self.flow_box.append(item_box)
     
     def create_thumbnail(self, image_path):
-        """Create thumbnail for image using PIL and GTK4"""
+        """Create a thumbnail widget; the image is decoded in the background"""
+        if not PIL_AVAILABLE:
+            # Fallback to generic icon if PIL not available
+            return self._generic_thumbnail()
+        
+        # Gtk.Picture uploads the image once and lets GSK scale it, instead of
+        # repainting through Cairo on every frame
+        thumbnail_widget = Gtk.Picture()
+        thumbnail_widget.set_size_request(150, 150)
+        thumbnail_widget.set_content_fit(Gtk.ContentFit.CONTAIN)
+        thumbnail_widget.set_can_shrink(True)
+        
+        # Check cache first; the mtime in the key drops entries for edited files
         try:
-            # Check cache first
-            cache_key = str(image_path)
-            if cache_key in self.thumbnail_cache:
-                cached_pixbuf = self.thumbnail_cache[cache_key]
-                thumbnail_widget = Gtk.DrawingArea()
-                thumbnail_widget.set_size_request(150, 150)
-                thumbnail_widget.set_draw_func(self.draw_thumbnail, cached_pixbuf)
-                # Store pixbuf reference to prevent garbage collection
-                thumbnail_widget._pixbuf = cached_pixbuf
-                return thumbnail_widget
-            
-            if not PIL_AVAILABLE:
-                # Fallback to generic icon if PIL not available
-                icon = Gtk.Image.new_from_icon_name("image-x-generic-symbolic")
-                icon.set_icon_size(Gtk.IconSize.LARGE)
-                icon.set_size_request(150, 150)
-                return icon
-            
-            # Fast path: use GdkPixbuf to load and scale directly (handles PNG/JPEG/WebP with alpha)
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(str(image_path), 150, 150, True)
-
-            # Cache the pixbuf for future use
-            self.thumbnail_cache[cache_key] = pixbuf
-
-            # Create DrawingArea for better size control (like main grid)
-            thumbnail_widget = Gtk.DrawingArea()
-            thumbnail_widget.set_size_request(150, 150)
-            thumbnail_widget.set_draw_func(self.draw_thumbnail, pixbuf)
-            # Store pixbuf reference to prevent garbage collection
-            thumbnail_widget._pixbuf = pixbuf
+            cache_key = (str(image_path), image_path.stat().st_mtime_ns)
+        except OSError:
+            cache_key = None
+        cached_texture = self._cache_get(cache_key)
+        if cached_texture is not None:
+            thumbnail_widget.set_paintable(cached_texture)
             return thumbnail_widget
-                
+        
+        self._pending_decodes.append((thumbnail_widget, image_path, cache_key))
+        return thumbnail_widget
+    
+    def _schedule_visible_decodes(self, *args):
+        """Check the viewport once the current layout pass has finished"""
+        if not self._decode_check_scheduled:
+            self._decode_check_scheduled = True
+            GLib.idle_add(self._submit_visible_decodes)
+    
+    def _submit_visible_decodes(self):
+        """Start decoding thumbnails within one page of the visible area"""
+        self._decode_check_scheduled = False
+        if not self._pending_decodes:
+            return GLib.SOURCE_REMOVE
+        page = self._vadjustment.get_page_size()
+        if page <= 0:
+            # Not laid out yet
+            self._retry_after_layout()
+            return GLib.SOURCE_REMOVE
+        if self._vadjustment.get_upper() <= page:
+            # Nothing to scroll: every item is visible
+            pending, self._pending_decodes = self._pending_decodes, []
+            self._submit_decodes(pending)
+            return GLib.SOURCE_REMOVE
+        top = self._vadjustment.get_value() - page
+        bottom = self._vadjustment.get_value() + 2 * page
+        
+        still_pending = []
+        batch = []
+        unallocated = False
+        for i, (widget, image_path, cache_key) in enumerate(self._pending_decodes):
+            ok, _x, y = widget.translate_coordinates(self.flow_box, 0, 0)
+            if not ok or widget.get_height() == 0:
+                unallocated = True
+                still_pending.append((widget, image_path, cache_key))
+            elif y + 150 < top:
+                still_pending.append((widget, image_path, cache_key))
+            elif y > bottom:
+                # Children are laid out in order, so everything after this is further down
+                still_pending.extend(self._pending_decodes[i:])
+                break
+            else:
+                batch.append((widget, image_path, cache_key))
+        self._pending_decodes = still_pending
+        self._submit_decodes(batch)
+        if unallocated:
+            self._retry_after_layout()
+        return GLib.SOURCE_REMOVE
+    
+    def _retry_after_layout(self):
+        """Re-run the viewport check on the next frame, after GTK has allocated the grid"""
+        if self._layout_retry_scheduled or not self.flow_box.get_mapped():
+            # An unmapped grid gets checked again from its 'map' handler
+            return
+        self._layout_retry_scheduled = True
+        
+        def on_tick(widget, frame_clock):
+            self._layout_retry_scheduled = False
+            self._schedule_visible_decodes()
+            return GLib.SOURCE_REMOVE
+        
+        self.flow_box.add_tick_callback(on_tick)
+    
+    def _submit_decodes(self, items):
+        """Queue readahead for a batch of (widget, path, cache_key) and decode them"""
+        if not items:
+            return
+        if hasattr(os, 'posix_fadvise'):
+            threading.Thread(target=self._prefetch_images,
+                             args=([path for _w, path, _k in items], self._load_generation),
+                             daemon=True).start()
+        for widget, image_path, cache_key in items:
+            self._submit_decode(widget, image_path, cache_key)
+    
+    def _submit_decode(self, thumbnail_widget, image_path, cache_key):
+        """Decode a thumbnail on the worker pool"""
+        generation = self._load_generation
+        future = _thumb_executor().submit(self._decode_pixbuf, image_path)
+        future.add_done_callback(
+            lambda f: self._queue_install(f, thumbnail_widget, image_path, cache_key, generation))
+        self._thumb_futures.append(future)
+    
+    def _cache_get(self, key):
+        """Look up a cached texture, marking it most recently used"""
+        texture = self.thumbnail_cache.get(key)
+        if texture is not None:
+            self.thumbnail_cache.move_to_end(key)
+        return texture
+    
+    def _cache_put(self, key, texture):
+        """Cache a texture, evicting the least recently used entries over the limit"""
+        if key is None:
+            return
+        self.thumbnail_cache[key] = texture
+        self.thumbnail_cache.move_to_end(key)
+        while len(self.thumbnail_cache) > self.THUMBNAIL_CACHE_LIMIT:
+            self.thumbnail_cache.popitem(last=False)
+    
+    def _thumb_cache_path(self, image_path):
+        """On-disk thumbnail location; a changed file gets a new key"""
+        st = os.stat(image_path)
+        data = f"{image_path}:{st.st_mtime_ns}:{st.st_size}".encode()
+        key = xxhash.xxh64(data).hexdigest() if XXHASH_AVAILABLE else hashlib.sha1(data).hexdigest()
+        return self._thumb_cache_dir / f"{key}.png"
+    
+    def _decode_pixbuf(self, image_path):
+        """Load and scale an image to thumbnail size (runs on a worker thread)"""
+        try:
+            cache_path = self._thumb_cache_path(image_path)
+        except OSError:
+            cache_path = None
+        if cache_path is not None and cache_path.exists():
+            try:
+                return GdkPixbuf.Pixbuf.new_from_file(str(cache_path))
+            except GLib.Error:
+                pass  # Truncated/corrupt entry: decode again and overwrite it
+        
+        if self._sniff(image_path) is None:
+            return None  # Not an image we can decode; skip the costly failed decode
+        
+        try:
+            pixbuf = _pil_thumbnail_pixbuf(image_path, (150, 150))
+        except Exception:
+            # Formats Pillow can't read (e.g. AVIF/HEIC without a plugin): let GdkPixbuf decode them
+            pixbuf = _load_pixbuf_scaled(image_path, (150, 150))
+        
+        if cache_path is not None:
+            # Write to a temp name first so a concurrent reader never sees a partial PNG
+            tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+            try:
+                pixbuf.savev(str(tmp_path), "png", [], [])
+                os.replace(tmp_path, cache_path)
+            except (GLib.Error, OSError) as e:
+                print(f"Warning: Could not cache thumbnail for {image_path}: {e}")
+                tmp_path.unlink(missing_ok=True)
+        return pixbuf
+    
+    def _queue_install(self, *install_args):
+        """Queue a finished decode for the next batch (any thread)"""
+        with self._pending_lock:
+            self._pending_installs.append(install_args)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        GLib.timeout_add(50, self._flush_pending)
+    
+    def _flush_pending(self):
+        """Install every queued thumbnail in one main loop iteration"""
+        with self._pending_lock:
+            pending = self._pending_installs
+            self._pending_installs = []
+            self._flush_scheduled = False
+        for install_args in pending:
+            self._install_pixbuf(*install_args)
+        return GLib.SOURCE_REMOVE
+    
+    @staticmethod
+    def _sniff(image_path):
+        """Identify an image format from its magic bytes, or None if unrecognized"""
+        try:
+            fd = os.open(image_path, os.O_RDONLY)
+            try:
+                head = os.read(fd, 12)
+            finally:
+                os.close(fd)
+        except OSError:
+            return None
+        if head.startswith(b'\xff\xd8\xff'):
+            return 'jpeg'
+        if head.startswith(b'\x89PNG'):
+            return 'png'
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return 'webp'
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return 'gif'
+        if head.startswith(b'BM'):
+            return 'bmp'
+        if head[:4] in (b'II*\x00', b'MM\x00*'):
+            return 'tiff'
+        if head[4:8] == b'ftyp':
+            return 'heif'  # ISO-BMFF container: AVIF/HEIC/HEIF
+        return None
+    
+    def _install_pixbuf(self, future, thumbnail_widget, image_path, cache_key, generation):
+        """Show a decoded thumbnail (main thread, from _flush_pending)"""
+        if (future.cancelled() or generation != self._load_generation
+                or thumbnail_widget.get_root() is None):
+            return
+        try:
+            pixbuf = future.result()
         except Exception as e:
             print(f"Error creating thumbnail for {image_path}: {e}")
+            pixbuf = None
+        if pixbuf is None:
             # Fallback to generic image icon
-            icon = Gtk.Image.new_from_icon_name("image-x-generic-symbolic")
-            icon.set_icon_size(Gtk.IconSize.LARGE)
-            icon.set_size_request(150, 150)
-            return icon
-    
-    def draw_thumbnail(self, area, cr, width, height, pixbuf):
-        """Draw pixbuf properly scaled and centered (same as main grid)"""
-        if pixbuf:
-            # Get pixbuf dimensions
-            pb_width = pixbuf.get_width()
-            pb_height = pixbuf.get_height()
-            
-            # Calculate scale to fit pixbuf in the drawing area
-            scale_x = width / pb_width
-            scale_y = height / pb_height
-            scale = min(scale_x, scale_y)  # Maintain aspect ratio
-            
-            # Calculate position to center the image
-            scaled_width = pb_width * scale
-            scaled_height = pb_height * scale
-            x_offset = (width - scaled_width) / 2
-            y_offset = (height - scaled_height) / 2
-            
-            # Apply transformations and draw
-            cr.save()
-            cr.translate(x_offset, y_offset)
-            cr.scale(scale, scale)
-            
-            # Use newer surface-based approach instead of deprecated cairo_set_source_pixbuf
+            overlay = thumbnail_widget.get_parent()
+            if isinstance(overlay, Gtk.Overlay):
+                overlay.set_child(self._generic_thumbnail())
+            return
+        
+        # Cache the texture for future use
+        texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+        self._cache_put(cache_key, texture)
+        thumbnail_widget.set_paintable(texture)
+    
+    @staticmethod
+    def _generic_thumbnail():
+        """Placeholder icon for images that can't be thumbnailed"""
+        icon = Gtk.Image.new_from_icon_name("image-x-generic-symbolic")
+        icon.set_icon_size(Gtk.IconSize.LARGE)
+        icon.set_size_request(150, 150)
+        return icon
+    
+    def _prefetch_images(self, images, generation):
+        """Queue kernel readahead for images without a disk thumbnail yet.
+
+        The decode workers read one file each; hinting the batch that just came
+        near the viewport keeps its reads in flight together so HDDs and network
+        shares can overlap them, without pulling in the rest of the folder.
+        """
+        budget = self.PREFETCH_BYTES
+        for image_path in images:
+            if generation != self._load_generation or budget <= 0:
+                return
             try:
-                surface = Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)
-                cr.set_source_surface(surface, 0, 0)
-            except:
-                # Fallback to deprecated method if new one fails
-                Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
-            
-            cr.paint()
-            cr.restore()
+                if self._thumb_cache_path(image_path).exists():
+                    continue
+                fd = os.open(image_path, os.O_RDONLY)
+                try:
+                    budget -= os.fstat(fd).st_size
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError:
+                continue
+    
+    def _on_destroy(self, widget):
+        """Drop pending thumbnail work when the dialog closes; the pool is shared"""
+        self._load_generation += 1
+        for future in self._thumb_futures:
+            future.cancel()
+        self._thumb_futures = []
+        self._pending_decodes = []
     
     def enter_folder(self, folder_path):
         """Enter selected folder"""
@@ -575,6 +903,9 @@ class WeatherSync:
         'Moderate or heavy snow with thunder': 'snow',
     }
 
+    # Lowercased once for the substring fallback in get_weather_description
+    _WTTR_CONDITIONS_LOWER = tuple((desc.lower(), cond) for desc, cond in WTTTR_CONDITION_MAP.items())
+
     # Condition descriptions by type
     CONDITION_DESCRIPTIONS = {
         'clear-day': ('☀️', 'Clear Day', ['sunny', 'bright', 'clear', 'blue sky', 'sunshine']),
@@ -598,10 +929,16 @@ class WeatherSync:
         'night': ('🌙', 'Night', ['night', 'dark', 'moon', 'stars', 'city lights']),
     }
 
+    # Local-hour fallback used when wttr.in has no sunrise/sunset data
+    _HOUR_TO_PERIOD = (('night',) * 5 + ('dawn',) * 2 + ('morning',) * 4 + ('noon',) * 3 +
+                       ('afternoon',) * 2 + ('sunset_transition',) * 2 + ('sunset',) * 2 +
+                       ('night',) * 4)
+
     def __init__(self):
         self._cached_weather = None
         self._cache_time = 0
         self._cache_ttl = 600  # Refresh weather every 10 minutes
+        self._keyword_patterns = {}  # frozenset(keywords) -> compiled alternation
 
     @staticmethod
     def _parse_hhmm(value):
@@ -659,21 +996,7 @@ class WeatherSync:
             return 'afternoon'
 
         # Fallback: no astronomy data available, estimate from the local hour.
-        hour = now.hour
-        if 5 <= hour < 7:
-            return 'dawn'
-        elif 7 <= hour < 11:
-            return 'morning'
-        elif 11 <= hour < 14:
-            return 'noon'
-        elif 14 <= hour < 16:
-            return 'afternoon'
-        elif 16 <= hour < 18:
-            return 'sunset_transition'
-        elif 18 <= hour < 20:
-            return 'sunset'
-        else:
-            return 'night'
+        return self._HOUR_TO_PERIOD[now.hour]
 
     def _fetch_real_weather(self):
         """Fetch real weather data from wttr.in (no API key required)."""
@@ -726,14 +1049,17 @@ class WeatherSync:
         condition = None
         if self._cached_weather and self._cached_weather.get('description'):
             raw_desc = self._cached_weather['description']
-            # Map the real weather description to our condition types
-            for wttr_desc, our_cond in self.WTTTR_CONDITION_MAP.items():
-                if wttr_desc.lower() in raw_desc.lower() or raw_desc.lower() in wttr_desc.lower():
-                    condition = our_cond
-                    break
+            raw_lower = raw_desc.lower()
+            # Map the real weather description to our condition types; wttr.in
+            # usually reports one of the map's keys verbatim
+            condition = self.WTTTR_CONDITION_MAP.get(raw_desc)
+            if not condition:
+                for wttr_lower, our_cond in self._WTTR_CONDITIONS_LOWER:
+                    if wttr_lower in raw_lower or raw_lower in wttr_lower:
+                        condition = our_cond
+                        break
             if not condition:
                 # Fallback: guess from keywords
-                raw_lower = raw_desc.lower()
                 if any(w in raw_lower for w in ['rain', 'drizzle', 'shower', 'thunder']):
                     condition = 'rain'
                 elif any(w in raw_lower for w in ['snow', 'sleet', 'blizzard', 'hail']):
@@ -782,28 +1108,38 @@ class WeatherSync:
             'raw_weather': self._cached_weather,
         }
     
-    def find_matching_wallpapers(self, wallpapers):
-        """Find wallpapers that match current weather/time conditions"""
+    def find_matching_wallpapers(self, wallpapers, lower_names=None):
+        """Find wallpapers that match current weather/time conditions
+
+        lower_names maps each wallpaper to its lowercased filename; the grid
+        builds it once per scan so repeated lookups don't redo the lowering.
+        """
         weather_info = self.get_weather_description()
-        keywords = weather_info['recommended_keywords']
+        keywords = frozenset(weather_info['recommended_keywords'])
         
-        matching_wallpapers = []
+        # One compiled alternation per keyword set scans each filename in a single pass
+        pattern = self._keyword_patterns.get(keywords)
+        if pattern is None:
+            pattern = re.compile('|'.join(map(re.escape, sorted(keywords))))
+            self._keyword_patterns[keywords] = pattern
         
+        search = pattern.search
+        if lower_names is None:
+            lower_names = {}
+        matching_wallpapers = []
         for wallpaper in wallpapers:
-            filename_lower = wallpaper.name.lower()
-            
-            # Check if any keywords match the filename
-            for keyword in keywords:
-                if keyword in filename_lower:
-                    matching_wallpapers.append(wallpaper)
-                    break
+            name = lower_names.get(wallpaper)
+            if name is None:
+                name = wallpaper.name.lower()
+            if search(name):
+                matching_wallpapers.append(wallpaper)
         
         # If no specific matches, return all wallpapers
         return matching_wallpapers if matching_wallpapers else wallpapers
     
-    def get_recommended_wallpaper(self, wallpapers):
+    def get_recommended_wallpaper(self, wallpapers, lower_names=None):
         """Get a recommended wallpaper based on current conditions"""
-        matching = self.find_matching_wallpapers(wallpapers)
+        matching = self.find_matching_wallpapers(wallpapers, lower_names)
         if matching:
             import random
             return random.choice(matching)
@@ -975,6 +1311,65 @@ class WeatherWidget(Gtk.Box):
             else:
                 self.animation_overlay.start_animation()
 
+def _file_cache_key(image_path: Path, variant: str) -> str:
+    """Hex key for a derived file from (path, mtime, size, variant)"""
+    st = image_path.stat()
+    data = f"{image_path}:{st.st_mtime_ns}:{st.st_size}:{variant}".encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _save_atomic(img, path: Path, **params):
+    """Save a PIL image under a sibling temp name, then rename it into place.
+
+    Derived files are reused whenever their name exists, so a save interrupted by a
+    crash must never leave a truncated file at the final path.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.",
+                                    suffix=f".part{path.suffix}")
+    os.close(fd)
+    try:
+        img.save(tmp_name, **params)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _prune_derived(directory: Path, pattern: str, keep: int):
+    """Delete all but the `keep` most recently used files matching pattern.
+
+    Leftover partial saves (".part") are removed once they are clearly abandoned.
+    """
+    now = time.time()
+    finished = []
+    for path in directory.glob(pattern):
+        try:
+            mtime = path.stat().st_mtime
+            if '.part' in path.name:
+                if now - mtime > 600:
+                    path.unlink()
+            else:
+                finished.append((mtime, path))
+        except OSError:
+            pass
+    finished.sort(reverse=True)
+    for _mtime, path in finished[keep:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _touch(path: Path):
+    """Mark a reused derived file as recently used for _prune_derived"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
 class PhotoEffects:
     """Photo effects and filters processor"""
     
@@ -1010,6 +1405,98 @@ class PhotoEffects:
         'dreamy': 'Dreamy'
     }
     
+    # Channel multiplier -> 256-entry lookup table for Image.point
+    _LUT_CACHE = {}
+    # Effect outputs are full-size wallpapers; keep only the most recent few
+    EFFECT_CACHE_LIMIT = 8
+
+    # Single-slot memo of the last apply_effect call: (path, mtime_ns, effect, temp_dir)
+    _last_call = None
+    _last_result = None
+    
+    @staticmethod
+    def _mul_lut(k: float) -> List[int]:
+        """Lookup table scaling a channel by k, clamped to 255"""
+        lut = PhotoEffects._LUT_CACHE.get(k)
+        if lut is None:
+            lut = PhotoEffects._LUT_CACHE[k] = [min(255, int(i * k)) for i in range(256)]
+        return lut
+    
+    @staticmethod
+    def _rgb_lut(kr: float, kg: float, kb: float) -> List[int]:
+        """768-entry table scaling R, G and B in a single RGB Image.point pass"""
+        return PhotoEffects._mul_lut(kr) + PhotoEffects._mul_lut(kg) + PhotoEffects._mul_lut(kb)
+    
+    # ITU-R 601 luma weights, as used by Image.convert('L') and ImageEnhance.Color
+    _LUMA = (0.299, 0.587, 0.114)
+    
+    @staticmethod
+    def _fused_enhance(img, *steps):
+        """Apply a chain of enhancer-style steps as few affine colour matrices as possible.
+
+        Brightness, Contrast and Color (and per-channel tints) are all linear in
+        RGB, so consecutive steps compose into one img.convert('RGB', matrix) pass.
+        The sequential ImageEnhance chain clamps to 0..255 after every step, so the
+        chain is only fused across a step when that step's output provably stays in
+        range for this image's channel extrema; otherwise the pass is flushed there
+        and clamped, exactly where the sequential chain would clamp. Results then
+        match the chain up to per-step rounding.
+        Contrast pivots on the running mean luminance, like ImageEnhance.Contrast.
+        Steps are ('brightness'|'contrast'|'color', factor) or ('tint', (kr, kg, kb)).
+        """
+        w = PhotoEffects._LUMA
+        identity = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+        a = identity
+        bias = [0.0, 0.0, 0.0]
+        stat = None  # statistics of the image the current pass starts from
+        
+        for index, (op, value) in enumerate(steps):
+            if op == 'brightness':
+                a = [[value * x for x in row] for row in a]
+                bias = [value * x for x in bias]
+            elif op == 'contrast':
+                if stat is None:
+                    stat = ImageStat.Stat(img)
+                mean_rgb = [sum(row[j] * stat.mean[j] for j in range(3)) + bias[i]
+                            for i, row in enumerate(a)]
+                pivot = int(sum(w[i] * mean_rgb[i] for i in range(3)) + 0.5)
+                a = [[value * x for x in row] for row in a]
+                bias = [value * x + (1.0 - value) * pivot for x in bias]
+            elif op == 'color':
+                # out = f*x + (1-f)*luma(x)
+                c = [[value * (i == j) + (1.0 - value) * w[j] for j in range(3)] for i in range(3)]
+                a = [[sum(c[i][k] * a[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+                bias = [sum(c[i][k] * bias[k] for k in range(3)) for i in range(3)]
+            elif op == 'tint':
+                a = [[value[i] * x for x in row] for i, row in enumerate(a)]
+                bias = [value[i] * x for i, x in enumerate(bias)]
+            
+            if index < len(steps) - 1:
+                if stat is None:
+                    stat = ImageStat.Stat(img)
+                if PhotoEffects._may_clip(a, bias, stat.extrema):
+                    img = img.convert('RGB', PhotoEffects._affine(a, bias))
+                    a, bias, stat = identity, [0.0, 0.0, 0.0], None
+        
+        return img.convert('RGB', PhotoEffects._affine(a, bias))
+    
+    @staticmethod
+    def _affine(a, bias):
+        """Flatten a 3x3 matrix plus bias into the 12-tuple Image.convert expects"""
+        return tuple(x for i in range(3) for x in (*a[i], bias[i]))
+    
+    @staticmethod
+    def _may_clip(a, bias, extrema) -> bool:
+        """Whether the affine map can push any channel outside 0..255 for inputs within extrema"""
+        for i in range(3):
+            low = bias[i] + sum(a[i][j] * (extrema[j][0] if a[i][j] >= 0 else extrema[j][1])
+                                for j in range(3))
+            high = bias[i] + sum(a[i][j] * (extrema[j][1] if a[i][j] >= 0 else extrema[j][0])
+                                 for j in range(3))
+            if low < 0 or high > 255:
+                return True
+        return False
+    
     @staticmethod
     def apply_effect(image_path: Path, effect: str, temp_dir: Path) -> Optional[Path]:
         """Apply photo effect to image and return temp file path"""
@@ -1017,6 +1504,21 @@ class PhotoEffects:
             return image_path
 
         try:
+            # Re-requesting the last image + effect (e.g. a carousel landing on the
+            # same wallpaper) skips straight to the previous result
+            call = (str(image_path), image_path.stat().st_mtime_ns, effect, str(temp_dir))
+            last = PhotoEffects._last_result
+            if call == PhotoEffects._last_call and last is not None and last.exists():
+                return last
+            
+            # Output is keyed on the source's identity and the effect, so re-applying
+            # the same effect reuses the file and an edited source never collides
+            temp_path = temp_dir / f"effect_{_file_cache_key(image_path, effect)}{image_path.suffix}"
+            if temp_path.exists():
+                _touch(temp_path)
+                PhotoEffects._last_call, PhotoEffects._last_result = call, temp_path
+                return temp_path
+            
             # Open image
             img = Image.open(image_path)
 
@@ -1051,60 +1553,24 @@ class PhotoEffects:
                 img = enhancer.enhance(0.5)
             elif effect == 'warmth':
                 # Warm tone - boost reds and reduce blues
-                r, g, b = img.split()
-                r = r.point(lambda x: min(255, int(x * 1.1)))
-                b = b.point(lambda x: int(x * 0.9))
-                img = Image.merge('RGB', (r, g, b))
+                img = img.point(PhotoEffects._rgb_lut(1.1, 1.0, 0.9))
             elif effect == 'cool':
                 # Cool tone - boost blues and reduce reds
-                r, g, b = img.split()
-                r = r.point(lambda x: int(x * 0.9))
-                b = b.point(lambda x: min(255, int(x * 1.1)))
-                img = Image.merge('RGB', (r, g, b))
+                img = img.point(PhotoEffects._rgb_lut(0.9, 1.0, 1.1))
             elif effect == 'sepia':
-                # Fast sepia using PIL only - much faster than numpy approach
-                # Convert to grayscale first, then apply sepia tint
-                grayscale = img.convert('L')
-                # Create sepia-tinted version by combining with brown overlay
-                img = Image.merge('RGB', (
-                    grayscale.point(lambda x: min(255, int(x * 1.0))),     # Red channel
-                    grayscale.point(lambda x: min(255, int(x * 0.85))),    # Green channel
-                    grayscale.point(lambda x: min(255, int(x * 0.65)))     # Blue channel
-                ))
+                # Luma with a brown tint, read and written in a single matrix pass
+                img = PhotoEffects._fused_enhance(img, ('color', 0.0), ('tint', (1.0, 0.85, 0.65)))
             elif effect == 'grayscale':
-                img = img.convert('L').convert('RGB')
+                img = PhotoEffects._fused_enhance(img, ('color', 0.0))
             elif effect == 'vintage':
-                # Optimized vintage effect using PIL enhancers only
-                # Apply contrast boost
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.2)
-
-                # Reduce saturation for vintage look
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(0.7)
-
-                # Add slight warm tone
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(1.05)
-
-                # Add slight sepia tone using color balance (faster approximation)
-                try:
-                    import numpy as np
-                    img_array = np.array(img).astype(np.float32)
-                    # Apply subtle sepia transformation (lighter than full sepia)
-                    img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.1, 0, 255)  # Boost red
-                    img_array[:, :, 1] = np.clip(img_array[:, :, 1] * 1.05, 0, 255)  # Slight green boost
-                    img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 0.9, 0, 255)   # Reduce blue
-                    img = Image.fromarray(img_array.astype(np.uint8))
-                except ImportError:
-                    # If numpy not available, just use the contrast and saturation changes
-                    pass
+                # Contrast boost, reduced saturation, slight warmth and a light
+                # sepia tint (red boost, slight green, less blue) in one pass
+                img = PhotoEffects._fused_enhance(
+                    img, ('contrast', 1.2), ('color', 0.7), ('brightness', 1.05),
+                    ('tint', (1.1, 1.05, 0.9)))
             elif effect == 'dramatic':
                 # High contrast with boosted saturation
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.8)
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.3)
+                img = PhotoEffects._fused_enhance(img, ('contrast', 1.8), ('color', 1.3))
             elif effect == 'soft':
                 # Soft focus with slight blur and brightness
                 img = img.filter(ImageFilter.GaussianBlur(radius=1))
@@ -1112,102 +1578,60 @@ class PhotoEffects:
                 img = enhancer.enhance(1.1)
             elif effect == 'vivid':
                 # Vivid colors - boost saturation and contrast
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.6)
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.2)
+                img = PhotoEffects._fused_enhance(img, ('color', 1.6), ('contrast', 1.2))
             elif effect == 'monochrome_blue':
                 # Blue tinted monochrome
-                grayscale = img.convert('L')
-                img = Image.merge('RGB', (
-                    grayscale.point(lambda x: int(x * 0.8)),    # Red channel
-                    grayscale.point(lambda x: int(x * 0.9)),    # Green channel
-                    grayscale.point(lambda x: min(255, int(x * 1.2)))  # Blue channel
-                ))
+                img = PhotoEffects._fused_enhance(img, ('color', 0.0), ('tint', (0.8, 0.9, 1.2)))
             elif effect == 'monochrome_red':
                 # Red tinted monochrome
-                grayscale = img.convert('L')
-                img = Image.merge('RGB', (
-                    grayscale.point(lambda x: min(255, int(x * 1.2))),  # Red channel
-                    grayscale.point(lambda x: int(x * 0.8)),    # Green channel
-                    grayscale.point(lambda x: int(x * 0.7))     # Blue channel
-                ))
+                img = PhotoEffects._fused_enhance(img, ('color', 0.0), ('tint', (1.2, 0.8, 0.7)))
             elif effect == 'high_contrast':
                 # Extreme contrast
                 enhancer = ImageEnhance.Contrast(img)
                 img = enhancer.enhance(2.0)
             elif effect == 'retro':
-                # Retro effect with reduced saturation and contrast
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(0.8)
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.3)
-                # Add yellow/orange tint
-                r, g, b = img.split()
-                r = r.point(lambda x: min(255, int(x * 1.05)))
-                g = g.point(lambda x: min(255, int(x * 1.02)))
-                b = b.point(lambda x: int(x * 0.85))
-                img = Image.merge('RGB', (r, g, b))
+                # Retro effect with reduced saturation and contrast, plus a
+                # yellow/orange tint
+                img = PhotoEffects._fused_enhance(
+                    img, ('color', 0.8), ('contrast', 1.3), ('tint', (1.05, 1.02, 0.85)))
             elif effect == 'cinematic':
                 # Cinematic effect with letterbox feel
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.4)
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.2)
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(0.9)
+                img = PhotoEffects._fused_enhance(
+                    img, ('contrast', 1.4), ('color', 1.2), ('brightness', 0.9))
             elif effect == 'pastel':
                 # Pastel colors - soft and light
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(0.6)
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(1.2)
+                img = PhotoEffects._fused_enhance(img, ('color', 0.6), ('brightness', 1.2))
             elif effect == 'neon':
                 # Neon glow effect
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(2.0)
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.5)
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(1.1)
+                img = PhotoEffects._fused_enhance(
+                    img, ('color', 2.0), ('contrast', 1.5), ('brightness', 1.1))
             elif effect == 'monochrome_green':
                 # Green tinted monochrome
-                grayscale = img.convert('L')
-                img = Image.merge('RGB', (
-                    grayscale.point(lambda x: int(x * 0.7)),
-                    grayscale.point(lambda x: min(255, int(x * 1.2))),
-                    grayscale.point(lambda x: int(x * 0.8))
-                ))
+                img = PhotoEffects._fused_enhance(img, ('color', 0.0), ('tint', (0.7, 1.2, 0.8)))
             elif effect == 'invert':
                 # Invert colors
                 from PIL import ImageOps
                 img = ImageOps.invert(img)
             elif effect == 'cyberpunk':
                 # Cyberpunk style - high contrast with blue/purple tint
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.6)
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.4)
-                # Apply blue/purple tint
-                r, g, b = img.split()
-                r = r.point(lambda x: int(x * 0.9))
-                g = g.point(lambda x: int(x * 0.95))
-                b = b.point(lambda x: min(255, int(x * 1.15)))
-                img = Image.merge('RGB', (r, g, b))
+                img = PhotoEffects._fused_enhance(
+                    img, ('contrast', 1.6), ('color', 1.4), ('tint', (0.9, 0.95, 1.15)))
             elif effect == 'dreamy':
                 # Dreamy effect - soft with warm tone
                 img = img.filter(ImageFilter.GaussianBlur(radius=1.5))
                 enhancer = ImageEnhance.Brightness(img)
                 img = enhancer.enhance(1.15)
                 # Add slight warm tone
-                r, g, b = img.split()
-                r = r.point(lambda x: min(255, int(x * 1.05)))
-                b = b.point(lambda x: int(x * 0.95))
-                img = Image.merge('RGB', (r, g, b))
-
-            # Save to temp file
-            temp_path = temp_dir / f"effect_{effect}_{image_path.name}"
-            img.save(temp_path, quality=95)
+                img = img.point(PhotoEffects._rgb_lut(1.05, 1.0, 0.95))
+
+            # Save to temp file. This is the wallpaper itself, so JPEGs keep high
+            # quality; PNGs are short-lived temp files, so favour encode speed.
+            if temp_path.suffix.lower() == '.png':
+                _save_atomic(img, temp_path, compress_level=1)
+            else:
+                _save_atomic(img, temp_path, quality=95)
+            _prune_derived(temp_dir, 'effect_*', PhotoEffects.EFFECT_CACHE_LIMIT)
+            PhotoEffects._last_call, PhotoEffects._last_result = call, temp_path
             return temp_path
 
         except Exception as e:
@@ -1220,15 +1644,24 @@ class HighResImageHandler:
     
     MAX_PREVIEW_SIZE = (400, 400)
     MAX_THUMBNAIL_SIZE = (200, 200)
+    # Previews are small; this only stops them accumulating without bound
+    PREVIEW_CACHE_LIMIT = 256
+    # Set from the app's cache dir by use_cache_dir(); without it info is cached in memory only
+    INFO_CACHE_FILE: Optional[Path] = None
+
+    # path -> {'stamp': [mtime_ns, size], 'info': {...}}, persisted at exit
+    _info_cache: Optional[Dict] = None
+    _info_lock = threading.Lock()
+    _info_dirty = False
+    _info_save_registered = False
     
     @staticmethod
     def is_high_res(image_path: Path) -> bool:
         """Check if image is high resolution"""
         try:
             if PIL_AVAILABLE:
-                with Image.open(image_path) as img:
-                    width, height = img.size
-                    return width > 2560 or height > 1440
+                info = HighResImageHandler.get_image_info(image_path)
+                return info['width'] > 2560 or info['height'] > 1440
             else:
                 # Fallback: check file size
                 return image_path.stat().st_size > 5 * 1024 * 1024  # 5MB
@@ -1242,48 +1675,116 @@ class HighResImageHandler:
             return image_path
         
         try:
-            preview_path = cache_dir / f"preview_{image_path.stem}.jpg"
+            preview_path = cache_dir / f"preview_{_file_cache_key(image_path, 'preview')}.jpg"
             
             if preview_path.exists():
+                _touch(preview_path)
                 return preview_path
             
             with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
+                # JPEGs decode at a reduced DCT scale; must happen before convert()
+                # forces a full-resolution load
+                img.draft('RGB', HighResImageHandler.MAX_PREVIEW_SIZE)
+                
+                # Palette/bilevel images would be resized with NEAREST; expand them first
+                if img.mode in ('1', 'P'):
                     img = img.convert('RGB')
                 
-                # Calculate new size maintaining aspect ratio
+                # Calculate new size maintaining aspect ratio; thumbnail() box-reduces
+                # by an integer factor before LANCZOS (reducing_gap defaults to 2.0)
                 img.thumbnail(HighResImageHandler.MAX_PREVIEW_SIZE, Image.Resampling.LANCZOS)
                 
+                # Any remaining conversion now touches preview-sized pixels only
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                
                 # Save optimized preview
-                img.save(preview_path, 'JPEG', quality=85, optimize=True)
-                return preview_path
+                # Single-pass baseline encode: Huffman optimisation and progressive
+                # scans cost extra encode passes for a few % on a cache file
+                _save_atomic(img, preview_path, format='JPEG', quality=85, optimize=False,
+                             progressive=False, subsampling=2)
+            _prune_derived(cache_dir, 'preview_*', HighResImageHandler.PREVIEW_CACHE_LIMIT)
+            return preview_path
         except Exception as e:
             print(f"Error creating preview for {image_path}: {e}")
             return image_path
     
-    @staticmethod
-    def get_image_info(image_path: Path) -> Dict:
-        """Get detailed image information"""
+    @classmethod
+    def use_cache_dir(cls, cache_dir: Path):
+        """Persist image info under the configured cache directory"""
+        with cls._info_lock:
+            cls.INFO_CACHE_FILE = cache_dir / "image_info.json"
+            cls._info_cache = None  # (re)load from the new location on next use
+
+    @classmethod
+    def _load_info_cache(cls) -> Dict:
+        """Load the image info sidecar once; call with _info_lock held"""
+        if cls._info_cache is None:
+            cls._info_cache = {}
+            if cls.INFO_CACHE_FILE is None:
+                return cls._info_cache
+            try:
+                with open(cls.INFO_CACHE_FILE, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    cls._info_cache = data
+            except (OSError, ValueError):
+                pass
+            if not cls._info_save_registered:
+                cls._info_save_registered = True
+                atexit.register(cls._save_info_cache)
+        return cls._info_cache
+
+    @classmethod
+    def _save_info_cache(cls):
+        """Write the image info sidecar back if anything changed"""
+        with cls._info_lock:
+            if not cls._info_dirty or cls._info_cache is None or cls.INFO_CACHE_FILE is None:
+                return
+            entries = {path: entry for path, entry in cls._info_cache.items()
+                       if os.path.exists(path)}
+            cls._info_dirty = False
         try:
-            if PIL_AVAILABLE:
-                with Image.open(image_path) as img:
-                    return {
-                        'width': img.width,
-                        'height': img.height,
-                        'format': img.format,
-                        'mode': img.mode,
-                        'size_mb': image_path.stat().st_size / (1024 * 1024)
-                    }
-            else:
+            cls.INFO_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cls.INFO_CACHE_FILE.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp, cls.INFO_CACHE_FILE)
+        except OSError as e:
+            print(f"Error saving image info cache: {e}")
+
+    @classmethod
+    def get_image_info(cls, image_path: Path) -> Dict:
+        """Get detailed image information, reusing the sidecar while the file is unchanged"""
+        try:
+            st = image_path.stat()
+            size_mb = st.st_size / (1024 * 1024)
+            if not PIL_AVAILABLE:
                 # Fallback info
                 return {
                     'width': 0,
                     'height': 0,
                     'format': 'Unknown',
                     'mode': 'Unknown',
-                    'size_mb': image_path.stat().st_size / (1024 * 1024)
+                    'size_mb': size_mb
                 }
+            key = str(image_path)
+            stamp = [st.st_mtime_ns, st.st_size]
+            with cls._info_lock:
+                entry = cls._load_info_cache().get(key)
+            if entry and entry.get('stamp') == stamp:
+                return dict(entry['info'], size_mb=size_mb)
+            with Image.open(image_path) as img:
+                info = {
+                    'width': img.width,
+                    'height': img.height,
+                    'format': img.format,
+                    'mode': img.mode,
+                }
+            with cls._info_lock:
+                cls._load_info_cache()[key] = {'stamp': stamp, 'info': info}
+                cls._info_dirty = True
+            return dict(info, size_mb=size_mb)
         except Exception:
             return {'width': 0, 'height': 0, 'format': 'Unknown', 'mode': 'Unknown', 'size_mb': 0}
 
@@ -1317,6 +1818,12 @@ class NotificationManager:
     @staticmethod
     def detect_notification_daemon() -> Optional[str]:
         """Detect the currently running notification daemon"""
+        # pgrep plus a reload probe per call; the daemon rarely changes
+        return _cached('notification_daemon', 300,
+                       NotificationManager._detect_notification_daemon)
+
+    @staticmethod
+    def _detect_notification_daemon() -> Optional[str]:
         try:
             result = subprocess.run(['pgrep', '-l', '-u', str(os.getuid())], 
                                   capture_output=True, text=True)
@@ -1349,13 +1856,9 @@ class NotificationManager:
             if config_path.exists():
                 existing_config = config_path.read_text()
             
-            config_lines = []
-            color_keys = {'background-color', 'text-color', 'border-color', 'progress-color'}
-            
-            for line in existing_config.split('\n'):
-                line = line.strip()
-                if not any(line.startswith(key + '=') for key in color_keys):
-                    config_lines.append(line)
+            color_prefixes = ('background-color=', 'text-color=', 'border-color=', 'progress-color=')
+            config_lines = [line for line in map(str.strip, existing_config.splitlines())
+                            if line and not line.startswith(color_prefixes)]
             
             config_lines.extend([
                 f"background-color={colors.get('background', '#2e2e2e')}",
@@ -1364,8 +1867,7 @@ class NotificationManager:
                 f"progress-color={colors.get('progress', '#6366f1')}",
             ])
             
-            config_content = '\n'.join(line for line in config_lines if line.strip())
-            config_path.write_text(config_content)
+            config_path.write_text('\n'.join(config_lines))
             
             subprocess.run(['makoctl', 'reload'], capture_output=True)
             return True
@@ -1388,6 +1890,11 @@ class CompositorDetector:
     @staticmethod
     def detect_compositor() -> Optional[str]:
         """Detect the currently running Wayland compositor"""
+        # The compositor does not change mid-session
+        return _cached('compositor', 3600, CompositorDetector._detect_compositor)
+
+    @staticmethod
+    def _detect_compositor() -> Optional[str]:
         try:
             if os.environ.get('XDG_CURRENT_DESKTOP'):
                 desktop = os.environ['XDG_CURRENT_DESKTOP'].lower()
@@ -1420,17 +1927,19 @@ class MonitorManager:
     
     def refresh_monitors(self) -> Dict[str, Dict]:
         """Detect all available monitors and their capabilities"""
-        self.monitors = {}
-        
+        # Short TTL coalesces bursts (several MonitorManagers, resize events)
+        # into a single hyprctl/niri/wlr-randr call
+        self.monitors = dict(_cached(('monitors', self.compositor), 2, self._detect_monitors))
+        return self.monitors
+    
+    def _detect_monitors(self) -> Dict[str, Dict]:
         if self.compositor == 'hyprland':
-            self.monitors = self._detect_hyprland_monitors()
+            return self._detect_hyprland_monitors()
         elif self.compositor == 'niri':
-            self.monitors = self._detect_niri_monitors()
+            return self._detect_niri_monitors()
         else:
             # Fallback to generic detection
-            self.monitors = self._detect_generic_monitors()
-        
-        return self.monitors
+            return self._detect_generic_monitors()
     
     def _detect_hyprland_monitors(self) -> Dict[str, Dict]:
         """Detect Hyprland monitors with detailed capabilities"""
@@ -1460,76 +1969,60 @@ class MonitorManager:
         """Detect niri monitors with detailed capabilities"""
         monitors = {}
         try:
-            # Get active monitors with detailed info
+            # Prefer the JSON output, like hyprctl monitors -j
+            result = subprocess.run(['niri', 'msg', '--json', 'outputs'],
+                                  capture_output=True, text=True)
+            if result.returncode == 0:
+                for connector, output in json.loads(result.stdout).items():
+                    modes = output.get('modes') or []
+                    current = output.get('current_mode')
+                    mode = modes[current] if current is not None and current < len(modes) else {}
+                    logical = output.get('logical') or {}
+                    monitors[connector] = {
+                        'name': ' '.join(str(output.get(k) or 'Unknown')
+                                         for k in ('make', 'model', 'serial')),
+                        'active': True,
+                        'width': mode.get('width', 1920),
+                        'height': mode.get('height', 1080),
+                        'refresh': mode.get('refresh_rate', 60000) / 1000,
+                        'scale': float(logical.get('scale', 1.0)),
+                        'x': logical.get('x', 0),
+                        'y': logical.get('y', 0)
+                    }
+                return monitors
+        except Exception as e:
+            print(f"Error reading niri JSON outputs, falling back to text: {e}")
+            monitors = {}
+        
+        try:
+            # Older niri: scan the human-readable output in one pass
             result = subprocess.run(['niri', 'msg', 'outputs'], 
                                   capture_output=True, text=True)
             if result.returncode == 0:
-                # Parse niri output format
-                current_monitor = None
-                current_monitor_id = None
-                
-                for line in result.stdout.split('\n'):
-                    line = line.strip()
-                    
-                    # Monitor header: Output "Monitor Name" (ID)
-                    if line.startswith('Output "') and '(' in line and ')' in line:
-                        # Extract monitor name and ID
-                        parts = line.split('"')
-                        if len(parts) >= 3:
-                            monitor_name = parts[1]
-                            id_part = line.split('(')[1].split(')')[0]
-                            current_monitor = monitor_name
-                            current_monitor_id = id_part
-                            monitors[current_monitor_id] = {
-                                'name': monitor_name,
-                                'active': True,
-                                'width': 1920,  # Will be updated when we parse mode
-                                'height': 1080,
-                                'refresh': 60.0,
-                                'scale': 1.0,
-                                'x': 0,
-                                'y': 0
-                            }
-                    
-                    # Current mode line
-                    elif 'Current mode:' in line and current_monitor_id:
-                        try:
-                            # Extract resolution and refresh rate: "3440x1440 @ 100.000 Hz"
-                            mode_part = line.split('Current mode:')[1].strip()
-                            if 'x' in mode_part and '@' in mode_part:
-                                res_part = mode_part.split('@')[0].strip()
-                                refresh_part = mode_part.split('@')[1].strip().replace('Hz', '').strip()
-                                
-                                # Handle "100.000 (preferred)" format by taking only the number part
-                                if ' ' in refresh_part:
-                                    refresh_part = refresh_part.split()[0]
-                                
-                                if 'x' in res_part:
-                                    width, height = res_part.split('x')
-                                    monitors[current_monitor_id]['width'] = int(width)
-                                    monitors[current_monitor_id]['height'] = int(height)
-                                    monitors[current_monitor_id]['refresh'] = float(refresh_part)
-                        except Exception as parse_error:
-                            print(f"Error parsing mode for {current_monitor}: {parse_error}")
-                    
-                    # Scale line
-                    elif 'Scale:' in line and current_monitor_id:
-                        try:
-                            scale_str = line.split('Scale:')[1].strip()
-                            monitors[current_monitor_id]['scale'] = float(scale_str)
-                        except Exception as parse_error:
-                            print(f"Error parsing scale for {current_monitor}: {parse_error}")
-                    
-                    # Logical position line
-                    elif 'Logical position:' in line and current_monitor_id:
-                        try:
-                            pos_part = line.split('Logical position:')[1].strip()
-                            if ',' in pos_part:
-                                x_str, y_str = pos_part.split(',')
-                                monitors[current_monitor_id]['x'] = int(x_str.strip())
-                                monitors[current_monitor_id]['y'] = int(y_str.strip())
-                        except Exception as parse_error:
-                            print(f"Error parsing position for {current_monitor}: {parse_error}")
+                current = None
+                for m in _NIRI_OUTPUTS_RE.finditer(result.stdout):
+                    if m.group('id'):
+                        current = monitors[m.group('id')] = {
+                            'name': m.group('name'),
+                            'active': True,
+                            'width': 1920,  # Updated by the mode line
+                            'height': 1080,
+                            'refresh': 60.0,
+                            'scale': 1.0,
+                            'x': 0,
+                            'y': 0
+                        }
+                    elif current is None:
+                        continue
+                    elif m.group('w'):
+                        current['width'] = int(m.group('w'))
+                        current['height'] = int(m.group('h'))
+                        current['refresh'] = float(m.group('r'))
+                    elif m.group('s'):
+                        current['scale'] = float(m.group('s'))
+                    else:
+                        current['x'] = int(m.group('x'))
+                        current['y'] = int(m.group('y'))
                             
         except Exception as e:
             print(f"Error detecting niri monitors: {e}")
@@ -1782,7 +2275,7 @@ class WallpaperConfig:
         self.keybind_mode_file = self.cache_dir / "keybind_mode"  # 'all' or 'active'
         
         # Enhanced image format support for high-res images
-        self.image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff', '.tif', '.avif', '.heic', '.heif'}
+        self.image_extensions = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff', '.tif', '.avif', '.heic', '.heif'})
         
         # Matugen color schemes (matching available schemes on system)
         self.matugen_schemes = {
@@ -1795,6 +2288,28 @@ class WallpaperConfig:
             'scheme-rainbow': 'Rainbow',
             'scheme-tonal-spot': 'Tonal Spot'
         }
+    
+    def is_image_name(self, name: str) -> bool:
+        """Check a bare file name against image_extensions without building a Path"""
+        # Like Path.suffix, a bare dot-name such as ".jpg" has no extension
+        dot = name.rfind('.')
+        return dot > 0 and name[dot:].lower() in self.image_extensions
+    
+    def list_images(self, directory: Optional[Path] = None) -> Tuple[List[Path], int]:
+        """Image files directly in directory (default: wallpaper_dir) and the entry count.
+
+        scandir supplies names and file types from the directory listing, so only
+        matching entries become Path objects.
+        """
+        directory = directory or self.wallpaper_dir
+        images = []
+        total = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                total += 1
+                if self.is_image_name(entry.name) and entry.is_file():
+                    images.append(Path(entry.path))
+        return images, total
 
 class ThumbnailManager:
     """Enhanced thumbnail manager with high-res support"""
@@ -1802,14 +2317,75 @@ class ThumbnailManager:
         self.config = config
         self.cache_dir = config.cache_dir / "thumbnails"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Sources whose cached thumbnail prewarm() found up to date
+        self._fresh = set()
+    
+    def prewarm(self, paths: List[Path]):
+        """Find up-to-date cached thumbnails with one scandir per directory.
+
+        create_thumbnail() then skips its per-image stat() calls for these paths.
+        Only entries named in paths (or their cache names) are stat()ed.
+        paths is the whole wallpaper set: cached thumbnails that match none of
+        them are left over from removed images or older cache names and are
+        deleted here.
+        """
+        def mtimes(directory, names, orphans=None):
+            found = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name not in names:
+                            if (orphans is not None and entry.name.endswith('.png')
+                                    and entry.is_file(follow_symlinks=False)):
+                                orphans.append(entry.path)
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        found[entry.name] = (st.st_mtime, st.st_size)
+            except OSError:
+                pass
+            return found
+        
+        thumb_names = {path: self.get_cache_path(path).name for path in paths}
+        wanted = {}
+        for path in paths:
+            wanted.setdefault(path.parent, set()).add(path.name)
+        
+        orphans = []
+        cached = mtimes(self.cache_dir, set(thumb_names.values()), orphans)
+        for orphan in orphans:
+            try:
+                os.unlink(orphan)
+            except OSError:
+                pass
+        sources = {parent: mtimes(parent, names) for parent, names in wanted.items()}
+        fresh = set()
+        for path in paths:
+            source = sources[path.parent].get(path.name)
+            thumb = cached.get(thumb_names[path])
+            if source and thumb and source[1] > 0 and thumb[0] >= source[0]:
+                fresh.add(path)
+        self._fresh = fresh
     
     def get_cache_path(self, image_path: Path) -> Path:
         """Get cache path for thumbnail"""
-        # Use PNG to support transparency (avoids RGBA->JPEG errors)
-        return self.cache_dir / f"{hashlib.md5(str(image_path).encode()).hexdigest()}.png"
+        # Use PNG to support transparency (avoids RGBA->JPEG errors); the hash is
+        # only a filename, so a 64-bit digest is plenty. Keep it stdlib-only so
+        # names don't change with the installed optional modules
+        key = hashlib.blake2b(os.fsencode(image_path), digest_size=8).hexdigest()
+        return self.cache_dir / f"{key}.png"
     
     def create_thumbnail(self, image_path: Path, size: Tuple[int, int] = (150, 150)) -> Optional[GdkPixbuf.Pixbuf]:
         """Create thumbnail with high-res support"""
+        if image_path in self._fresh:
+            try:
+                return GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                    str(self.get_cache_path(image_path)), size[0], size[1], True)
+            except Exception:
+                self._fresh.discard(image_path)
+        
         # Validate image file first
         try:
             if not image_path.exists():
@@ -1840,9 +2416,16 @@ class ThumbnailManager:
             # Disable high-res processing for debugging - use original image directly
             source_path = image_path
             
-            # Create thumbnail
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
-                str(source_path), size[0], size[1], True)
+            # Create thumbnail; Pillow can decode JPEGs at reduced scale, GdkPixbuf
+            # covers formats it can't read
+            pixbuf = None
+            if PIL_AVAILABLE:
+                try:
+                    pixbuf = _pil_thumbnail_pixbuf(source_path, size)
+                except Exception:
+                    pixbuf = None
+            if pixbuf is None:
+                pixbuf = _load_pixbuf_scaled(source_path, size)
             
             # Save to cache as PNG to support images with alpha channel
             pixbuf.savev(str(cache_path), "png", [], [])
@@ -1861,6 +2444,8 @@ class WallpaperTimer:
         self.timer_id = None
         self.running = False
         self.interval = 300  # 5 minutes default
+        # Private generator so auto-change picks don't share the module-level RNG
+        self._rng = random.Random()
     
     def start(self, interval_seconds: int):
         """Start the timer"""
@@ -1885,8 +2470,9 @@ class WallpaperTimer:
         
         try:
             # Change to random wallpaper
-            if self.app.grid_view.wallpapers:
-                random_wallpaper = random.choice(self.app.grid_view.wallpapers)
+            wallpapers = self.app.grid_view.wallpapers
+            if wallpapers:
+                random_wallpaper = self._rng.choice(wallpapers)
                 current_effect = self.app.wallpaper_setter.get_current_effect()
                 print(f"⏰ Auto-changing to: {random_wallpaper.name}")
                 GLib.idle_add(self.app.set_wallpaper_with_effect, random_wallpaper, current_effect)
@@ -2464,10 +3050,7 @@ class WallpaperSetter:
     def update_current_index(self, image_path: Path):
         """Update the current index for keybind sync"""
         try:
-            wallpapers = []
-            for file_path in self.config.wallpaper_dir.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in self.config.image_extensions:
-                    wallpapers.append(file_path)
+            wallpapers, _ = self.config.list_images()
             
             wallpapers.sort(key=lambda x: str(x))
             
@@ -2687,6 +3270,8 @@ class WallpaperGridView(Gtk.ScrolledWindow):
         self.setup_drag_and_drop()
         
         self.wallpapers = []
+        self.wallpaper_names = {}  # Path -> lowercased filename, rebuilt on every scan
+        self._grid_generation = 0
         self.selected_wallpaper_path = None
         self.selected_wallpapers = set()
     
@@ -2756,23 +3341,20 @@ class WallpaperGridView(Gtk.ScrolledWindow):
     def load_wallpapers(self):
         """Load wallpapers from directory"""
         self.wallpapers = []
+        self.wallpaper_names = {}
         
         if not self.app.config.wallpaper_dir.exists():
             print(f"Wallpaper directory does not exist: {self.app.config.wallpaper_dir}")
             return
         
-        total_files = 0
-        for file_path in self.app.config.wallpaper_dir.iterdir():
-            total_files += 1
-            # Skip directories (including .removed) and load only image files
-            if (file_path.is_file() and 
-                file_path.suffix.lower() in self.app.config.image_extensions):
-                self.wallpapers.append(file_path)
+        # Skips directories (including .removed) and loads only image files
+        self.wallpapers, total_files = self.app.config.list_images()
         
         print(f"Debug: Found {len(self.wallpapers)} wallpapers out of {total_files} total files in {self.app.config.wallpaper_dir}")
         print(f"Debug: Image extensions: {self.app.config.image_extensions}")
         
-        self.wallpapers.sort(key=lambda x: x.name.lower())
+        self.wallpaper_names = {p: p.name.lower() for p in self.wallpapers}
+        self.wallpapers.sort(key=self.wallpaper_names.__getitem__)
         self.update_grid()
     
     def update_grid(self):
@@ -2789,26 +3371,51 @@ class WallpaperGridView(Gtk.ScrolledWindow):
         
         print(f"Debug: Removed {removed_count} old thumbnails")
         
-        for i, wallpaper_path in enumerate(self.wallpapers):
+        # Results still in flight from a previous refresh are dropped on arrival
+        self._grid_generation += 1
+        generation = self._grid_generation
+        wallpapers = list(self.wallpapers)
+        
+        def prewarm_and_populate():
+            # The cache freshness scan stats whole directories; keep it off the UI thread
+            try:
+                self.app.thumbnail_manager.prewarm(wallpapers)
+            except Exception as e:
+                print(f"Warning: Could not prewarm thumbnail cache: {e}")
+            GLib.idle_add(self._populate_grid, wallpapers, generation)
+        
+        _thumb_executor().submit(prewarm_and_populate)
+    
+    def _populate_grid(self, wallpapers: List[Path], generation: int):
+        """Queue thumbnails for every wallpaper once prewarm() has finished"""
+        if generation != self._grid_generation:
+            return GLib.SOURCE_REMOVE
+        for wallpaper_path in wallpapers:
             self.add_thumbnail(wallpaper_path)
         
-        print(f"Debug: Added {len(self.wallpapers)} new thumbnails")
+        print(f"Debug: Added {len(wallpapers)} new thumbnails")
+        return GLib.SOURCE_REMOVE
     
     def add_thumbnail(self, image_path: Path):
         """Add a thumbnail to the grid with enhanced info"""
+        generation = self._grid_generation
+
         def create_thumb():
+            # Pillow releases the GIL while decoding and resampling, so the
+            # shared pool scales with cores instead of one thread per image
             pixbuf = self.app.thumbnail_manager.create_thumbnail(image_path)
             image_info = HighResImageHandler.get_image_info(image_path)
-            GLib.idle_add(self.add_thumbnail_widget, image_path, pixbuf, image_info)
+            GLib.idle_add(self.add_thumbnail_widget, image_path, pixbuf, image_info, generation)
         
-        thread = threading.Thread(target=create_thumb)
-        thread.daemon = True
-        thread.start()
+        _thumb_executor().submit(create_thumb)
     
-    def add_thumbnail_widget(self, image_path: Path, pixbuf: Optional[GdkPixbuf.Pixbuf], image_info: Dict):
+    def add_thumbnail_widget(self, image_path: Path, pixbuf: Optional[GdkPixbuf.Pixbuf],
+                             image_info: Dict, generation: Optional[int] = None):
         """Add enhanced thumbnail widget to flowbox"""
         if pixbuf is None:
             return
+        if generation is not None and generation != self._grid_generation:
+            return
         
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
         box.set_margin_top(8)
@@ -2816,13 +3423,12 @@ class WallpaperGridView(Gtk.ScrolledWindow):
         box.set_margin_start(8)
         box.set_margin_end(8)
         
-        # Use DrawingArea instead of Gtk.Image to bypass scaling issues
-        image = Gtk.DrawingArea()
+        # Gtk.Picture (not Gtk.Image, which forces icon sizing) scales the
+        # texture on the GPU via GSK; no per-frame Cairo rasterization
+        image = Gtk.Picture.new_for_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
         image.set_size_request(150, 150)
-        image.set_draw_func(self.draw_pixbuf, pixbuf)
-        
-        # Store pixbuf reference to prevent garbage collection
-        image._pixbuf = pixbuf
+        image.set_content_fit(Gtk.ContentFit.CONTAIN)
+        image.set_can_shrink(True)
         
         frame = Gtk.Frame()
         frame.set_child(image)
@@ -2855,40 +3461,6 @@ class WallpaperGridView(Gtk.ScrolledWindow):
         
         self.flowbox.append(box)
     
-    def draw_pixbuf(self, area, cr, width, height, pixbuf):
-        """Draw pixbuf properly scaled and centered"""
-        if pixbuf:
-            # Get pixbuf dimensions
-            pb_width = pixbuf.get_width()
-            pb_height = pixbuf.get_height()
-            
-            # Calculate scale to fit pixbuf in the drawing area
-            scale_x = width / pb_width
-            scale_y = height / pb_height
-            scale = min(scale_x, scale_y)  # Maintain aspect ratio
-            
-            # Calculate position to center the image
-            scaled_width = pb_width * scale
-            scaled_height = pb_height * scale
-            x_offset = (width - scaled_width) / 2
-            y_offset = (height - scaled_height) / 2
-            
-            # Apply transformations and draw
-            cr.save()
-            cr.translate(x_offset, y_offset)
-            cr.scale(scale, scale)
-            
-            # Use newer surface-based approach instead of deprecated cairo_set_source_pixbuf
-            try:
-                surface = Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)
-                cr.set_source_surface(surface, 0, 0)
-            except:
-                # Fallback to deprecated method if new one fails
-                Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
-            
-            cr.paint()
-            cr.restore()
-    
     def on_wallpaper_activated(self, flowbox, child):
         """Handle wallpaper double-click"""
         box = child.get_child()
@@ -2939,11 +3511,16 @@ class WallpaperApp(Gtk.ApplicationWindow):
         
         # Initialize configuration and managers
         self.config = WallpaperConfig()
+        HighResImageHandler.use_cache_dir(self.config.cache_dir)
         self.compositor = CompositorDetector.detect_compositor()
         # Use backend manager instead of old MonitorManager
         self.backend_manager = _import_backend_manager()
         self.thumbnail_manager = ThumbnailManager(self.config)
         self.wallpaper_setter = WallpaperSetter(self.config)
+        # Effect processing + wallpaper setting run one at a time off the UI
+        # thread; requests superseded before they start are skipped
+        self._apply_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='apply')
+        self._apply_generation = 0
         self.wallpaper_timer = WallpaperTimer(self)
         self.system_tray = None
         
@@ -3816,7 +4393,12 @@ class WallpaperApp(Gtk.ApplicationWindow):
         monitor_text = f" on {monitor}" if monitor else ""
         self.update_status(f"Setting wallpaper with {effect_display} effect{monitor_text}...")
         
+        self._apply_generation += 1
+        generation = self._apply_generation
+        
         def set_in_background():
+            if generation != self._apply_generation:
+                return  # A newer wallpaper/effect was requested while this one waited
             success = self.wallpaper_setter.set_wallpaper(image_path, monitor, transition, effect)
             if success:
                 effect_display = PhotoEffects.EFFECTS.get(effect, 'blur')
@@ -3835,9 +4417,7 @@ class WallpaperApp(Gtk.ApplicationWindow):
             else:
                 GLib.idle_add(self.update_status, "❌ Failed to set wallpaper")
         
-        thread = threading.Thread(target=set_in_background)
-        thread.daemon = True
-        thread.start()
+        self._apply_executor.submit(set_in_background)
     
     def update_status(self, message: str):
         """Update status label"""
@@ -3867,7 +4447,8 @@ class WallpaperApp(Gtk.ApplicationWindow):
             return
         
         # Get weather-recommended wallpaper
-        recommended_wallpaper = self.weather_sync.get_recommended_wallpaper(self.grid_view.wallpapers)
+        recommended_wallpaper = self.weather_sync.get_recommended_wallpaper(
+            self.grid_view.wallpapers, self.grid_view.wallpaper_names)
         
         if recommended_wallpaper:
             current_effect = self.wallpaper_setter.get_current_effect()
@@ -4549,10 +5130,7 @@ def handle_command_line_args(args):
     
     if command == "--random":
         # Set random wallpaper with monitor-aware behavior
-        wallpapers = []
-        for file_path in config.wallpaper_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in config.image_extensions:
-                wallpapers.append(file_path)
+        wallpapers, _ = config.list_images()
         
         if wallpapers:
             import random